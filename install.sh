@@ -66,17 +66,20 @@ pip3 install --upgrade pip
 # Instalar dependências principais
 pip3 install \
     PyPDF2 \
+    PyMuPDF \
     python-docx \
     openpyxl \
     pillow \
     mutagen \
     opencv-python \
+    av \
     rich \
     click \
     jinja2 \
     pandas \
     colorama \
     python-magic \
+    charset-normalizer \
     pytest \
     pytest-cov
 
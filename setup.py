@@ -10,12 +10,30 @@ from pathlib import Path
 readme_path = Path(__file__).parent / "README.md"
 long_description = readme_path.read_text(encoding="utf-8") if readme_path.exists() else ""
 
-# Ler requirements
+# Ler requirements (ignorando linhas vazias e comentários)
 requirements_path = Path(__file__).parent / "requirements.txt"
 requirements = []
 if requirements_path.exists():
-    requirements = requirements_path.read_text(encoding="utf-8").strip().split("\n")
-    requirements = [req.strip() for req in requirements if req.strip() and not req.startswith("#")]
+    requirements = [
+        line.strip()
+        for line in requirements_path.read_text(encoding="utf-8").splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+# Dependências opcionais; "all" é derivado das demais para não divergir
+dev_requirements = [
+    "pytest>=7.0.0",
+    "pytest-cov>=4.0.0",
+    "black>=22.0.0",
+    "flake8>=5.0.0",
+    "mypy>=0.991",
+    "pre-commit>=2.20.0",
+]
+web_requirements = [
+    "flask>=2.2.0",
+    "flask-cors>=4.0.0",
+    "gunicorn>=20.1.0",
+]
 
 setup(
     name="forensic-tool",
@@ -52,36 +70,22 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
-        "dev": [
-            "pytest>=7.0.0",
-            "pytest-cov>=4.0.0",
-            "black>=22.0.0",
-            "flake8>=5.0.0",
-            "mypy>=0.991",
-            "pre-commit>=2.20.0",
-        ],
-        "web": [
-            "flask>=2.2.0",
-            "flask-cors>=4.0.0",
-            "gunicorn>=20.1.0",
-        ],
-        "all": [
-            "pytest>=7.0.0",
-            "pytest-cov>=4.0.0",
-            "black>=22.0.0",
-            "flake8>=5.0.0",
-            "mypy>=0.991",
-            "pre-commit>=2.20.0",
-            "flask>=2.2.0",
-            "flask-cors>=4.0.0",
-            "gunicorn>=20.1.0",
-        ],
+        "dev": dev_requirements,
+        "web": web_requirements,
+        "all": dev_requirements + web_requirements,
     },
     entry_points={
         "console_scripts": [
             "forensic-tool=forensic_tool.cli.main:main",
             "forensic-web=forensic_tool.web.server:main",
         ],
+        "forensic_tool.analyzers": [
+            "image=forensic_tool.analyzers.image_analyzer:ImageAnalyzer",
+            "document=forensic_tool.analyzers.document_analyzer:DocumentAnalyzer",
+            "media=forensic_tool.analyzers.media_analyzer:MediaAnalyzer",
+            "network=forensic_tool.analyzers.network_analyzer:NetworkAnalyzer",
+            "security=forensic_tool.analyzers.security_analyzer:SecurityAnalyzer",
+        ],
     },
     include_package_data=True,
     package_data={
@@ -14,16 +14,47 @@ __author__ = "Santos (Refatorado)"
 __email__ = "contato@forensictool.com"
 __license__ = "MIT"
 
-# Importações principais
-# from .core.analyzer import ForensicAnalyzer  # Removido - não existe mais
-from .core.manager import AnalysisManager
-from .core.database import ResultsDatabase
-from .core.config import Config
-
-# Importações de utilitários
-from .utils.hashing import HashCalculator
-from .utils.file_utils import FileValidator, FileScanner
-from .utils.logger import setup_logger
+import importlib
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .core.manager import AnalysisManager
+    from .core.database import ResultsDatabase
+    from .core.config import Config
+    from .utils.hashing import HashCalculator
+    from .utils.file_utils import FileValidator, FileScanner
+    from .utils.logger import setup_logger
+
+# Reexportações carregadas sob demanda (PEP 562), para que `import forensic_tool`
+# não pague pelo carregamento de banco de dados, configuração e analisadores
+_LAZY_ATTRS = {
+    # Importações principais
+    "AnalysisManager": (".core.manager", "AnalysisManager"),
+    "ResultsDatabase": (".core.database", "ResultsDatabase"),
+    "Config": (".core.config", "Config"),
+    # Importações de utilitários
+    "HashCalculator": (".utils.hashing", "HashCalculator"),
+    "FileValidator": (".utils.file_utils", "FileValidator"),
+    "FileScanner": (".utils.file_utils", "FileScanner"),
+    "setup_logger": (".utils.logger", "setup_logger"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa a reexportação solicitada no primeiro acesso"""
+    try:
+        module_name, attr = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
+
 
 __all__ = [
     "__version__",
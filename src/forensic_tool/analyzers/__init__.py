@@ -2,30 +2,145 @@
 Analisadores especializados para diferentes tipos de arquivo
 """
 
-from .base import BaseAnalyzer, AnalysisResult, AnalyzerRegistry, get_registry
-from .image_analyzer import ImageAnalyzer
-from .document_analyzer import DocumentAnalyzer
-from .media_analyzer import MediaAnalyzer
-from .network_analyzer import NetworkAnalyzer
-from .security_analyzer import SecurityAnalyzer
+import importlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Type
+
+from .base import BaseAnalyzer, AnalysisResult, AnalyzerRegistry, get_registry, FILE_TYPE_MAP
+
+if TYPE_CHECKING:
+    from .image_analyzer import ImageAnalyzer
+    from .document_analyzer import DocumentAnalyzer
+    from .media_analyzer import MediaAnalyzer
+    from .network_analyzer import NetworkAnalyzer
+    from .security_analyzer import SecurityAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Analisadores carregados sob demanda (PEP 562): cada submódulo só é
+# importado no primeiro acesso ao atributo correspondente
+_LAZY = {
+    'ImageAnalyzer': '.image_analyzer',
+    'DocumentAnalyzer': '.document_analyzer',
+    'MediaAnalyzer': '.media_analyzer',
+    'NetworkAnalyzer': '.network_analyzer',
+    'SecurityAnalyzer': '.security_analyzer',
+}
+
+# Grupo de entry points para analisadores de terceiros (ver setup.py)
+ENTRY_POINT_GROUP = 'forensic_tool.analyzers'
+
+# Nomes dos analisadores embutidos, os mesmos declarados em setup.py
+_BUILTIN_ANALYZERS = {
+    'image': 'ImageAnalyzer',
+    'document': 'DocumentAnalyzer',
+    'media': 'MediaAnalyzer',
+    'network': 'NetworkAnalyzer',
+    'security': 'SecurityAnalyzer',
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Importa o analisador solicitado no primeiro acesso"""
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    module = importlib.import_module(module_name, __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY))
+
+
+def _iter_entry_points():
+    """Lista os entry points do grupo de analisadores instalados"""
+    try:
+        eps = entry_points()
+    except Exception as e:
+        logger.debug(f"Erro ao consultar entry points: {e}")
+        return []
+
+    # Python 3.10+ expõe select(); versões anteriores retornam um dict
+    if hasattr(eps, 'select'):
+        return list(eps.select(group=ENTRY_POINT_GROUP))
+    return list(eps.get(ENTRY_POINT_GROUP, []))
+
+
+@lru_cache(maxsize=None)
+def _load_analyzer_class(name: str) -> Type[BaseAnalyzer]:
+    """Resolve (uma única vez) a classe do analisador com o nome informado"""
+    if name in _BUILTIN_ANALYZERS:
+        # Analisadores embutidos são importados relativamente ao pacote, o que
+        # também funciona a partir do código-fonte, sem instalação
+        return __getattr__(_BUILTIN_ANALYZERS[name])
+
+    for entry_point in _iter_entry_points():
+        if entry_point.name == name:
+            return entry_point.load()
+
+    raise KeyError(f"Analisador desconhecido: {name}")
+
+
+@lru_cache(maxsize=None)
+def _get_analyzer(name: str) -> BaseAnalyzer:
+    """
+    Instância única (por processo) do analisador com o nome informado
+
+    Os analisadores não guardam estado entre arquivos e seus handlers são
+    reentrantes, então uma mesma instância atende todos os registros.
+    """
+    return _load_analyzer_class(name)()
+
+
+def get_available_analyzers() -> List[str]:
+    """
+    Lista os nomes dos analisadores disponíveis, sem importá-los
+
+    Returns:
+        Nomes dos analisadores embutidos seguidos dos de terceiros
+    """
+    names = list(_BUILTIN_ANALYZERS)
+    for entry_point in _iter_entry_points():
+        if entry_point.name not in names:
+            names.append(entry_point.name)
+    return names
+
 
 # Função para registrar todos os analisadores
-def register_all_analyzers() -> AnalyzerRegistry:
+def register_all_analyzers(only: Optional[Iterable[str]] = None) -> AnalyzerRegistry:
     """
     Registra todos os analisadores disponíveis
-    
+
+    Args:
+        only: Nomes dos analisadores a carregar (ex: ['image']); None carrega todos
+
     Returns:
         Registry com todos os analisadores registrados
     """
     registry = get_registry()
-    
-    # Registrar analisadores
-    registry.register(ImageAnalyzer())
-    registry.register(DocumentAnalyzer())
-    registry.register(MediaAnalyzer())
-    registry.register(NetworkAnalyzer())
-    registry.register(SecurityAnalyzer())
-    
+
+    names = get_available_analyzers()
+    if only is not None:
+        wanted = set(only)
+        names = [name for name in names if name in wanted]
+
+    # Instanciar em paralelo: os construtores são dominados pela importação
+    # das bibliotecas de cada formato, que libera o GIL durante o I/O
+    with ThreadPoolExecutor(max_workers=max(len(names), 1)) as executor:
+        analyzers = list(executor.map(_get_analyzer, names))
+
+    # Registrar analisadores (em ordem, preservando a prioridade por extensão)
+    for analyzer in analyzers:
+        registry.register(analyzer)
+
     return registry
 
 __all__ = [
@@ -33,10 +148,13 @@ __all__ = [
     'AnalysisResult',
     'AnalyzerRegistry',
     'get_registry',
+    'FILE_TYPE_MAP',
     'ImageAnalyzer',
-    'DocumentAnalyzer', 
+    'DocumentAnalyzer',
     'MediaAnalyzer',
     'NetworkAnalyzer',
     'SecurityAnalyzer',
     'register_all_analyzers',
+    'get_available_analyzers',
+    'ENTRY_POINT_GROUP',
 ]
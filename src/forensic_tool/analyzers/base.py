@@ -4,15 +4,103 @@ Classe base abstrata para analisadores de arquivos
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Set
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Set, FrozenSet, Mapping, Iterable, Iterator, Pattern, Sequence, Tuple
 from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import logging
+import multiprocessing
+import operator
+import os
+import re
+import stat
+import sys
+import threading
+import time
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# `slots=True` só existe a partir do Python 3.10
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Campos serializados diretamente por AnalysisResult.to_dict
+_RESULT_FIELDS = (
+    'file_path', 'file_name', 'file_size', 'file_type', 'analysis_type',
+    'metadata', 'success', 'error_message', 'analysis_duration'
+)
+_get_result_fields = operator.attrgetter(*_RESULT_FIELDS)
+
+# Mapeamento básico de extensões para tipos (somente leitura; também usado
+# pelo FileScanner como filtro de extensões conhecidas)
+FILE_TYPE_MAP: Mapping[str, str] = MappingProxyType({
+    # Imagens
+    '.jpg': 'JPEG Image', '.jpeg': 'JPEG Image',
+    '.png': 'PNG Image', '.gif': 'GIF Image',
+    '.bmp': 'BMP Image', '.tiff': 'TIFF Image', '.tif': 'TIFF Image',
+    '.webp': 'WebP Image',
+    
+    # Documentos
+    '.pdf': 'PDF Document',
+    '.docx': 'Word Document', '.doc': 'Word Document',
+    '.xlsx': 'Excel Spreadsheet', '.xls': 'Excel Spreadsheet',
+    '.pptx': 'PowerPoint Presentation', '.ppt': 'PowerPoint Presentation',
+    '.txt': 'Text Document', '.rtf': 'Rich Text Document',
+    
+    # Áudio
+    '.mp3': 'MP3 Audio', '.wav': 'WAV Audio',
+    '.flac': 'FLAC Audio', '.m4a': 'M4A Audio',
+    '.aac': 'AAC Audio', '.ogg': 'OGG Audio',
+    
+    # Vídeo
+    '.mp4': 'MP4 Video', '.avi': 'AVI Video',
+    '.mkv': 'MKV Video', '.mov': 'QuickTime Video',
+    '.wmv': 'WMV Video', '.flv': 'FLV Video',
+    
+    # Arquivos
+    '.zip': 'ZIP Archive', '.rar': 'RAR Archive',
+    '.7z': '7-Zip Archive', '.tar': 'TAR Archive',
+    '.gz': 'GZIP Archive'
+})
+
+
+# Analisador de cada processo dos pools criados por
+# BaseAnalyzer._analyze_many_in_processes
+_worker_analyzer: Optional['BaseAnalyzer'] = None
+
+# Memória compartilhada com o processo principal: cada processo do pool
+# ocupa uma posição e nela grava o índice do arquivo em análise (-1 quando
+# ocioso), o que permite identificar o arquivo que derrubou o processo
+_worker_in_flight = None
+_worker_slot = 0
+
+# Mensagem dos arquivos em análise quando o processo do pool morreu
+_WORKER_CRASH_MESSAGE = "Processo de análise encerrado inesperadamente"
+
+
+def _init_analyzer_worker(analyzer_class: type, in_flight, slots) -> None:
+    """Cria o analisador do processo (uma vez por processo do pool)"""
+    global _worker_analyzer, _worker_in_flight, _worker_slot
+    with slots.get_lock():
+        _worker_slot = slots.value
+        slots.value += 1
+    _worker_in_flight = in_flight
+    _worker_analyzer = analyzer_class()
+    _worker_analyzer._prepare_worker()
+
+
+def _analyze_batch_in_worker(items: List[Tuple[int, Path]]) -> List['AnalysisResult']:
+    """Analisa um lote de (índice, caminho) no processo do pool (função picklable)"""
+    results = []
+    for index, file_path in items:
+        _worker_in_flight[_worker_slot] = index
+        results.append(_worker_analyzer.analyze(file_path))
+        _worker_in_flight[_worker_slot] = -1
+    return results
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class AnalysisResult:
     """Resultado de análise de arquivo"""
     file_path: str
@@ -30,20 +118,47 @@ class AnalysisResult:
         if self.timestamp is None:
             self.timestamp = datetime.now()
     
+    @classmethod
+    def build(cls, *, file_path: str, file_name: str, file_size: int, file_type: str,
+              analysis_type: str, metadata: Dict[str, Any], success: bool,
+              error_message: Optional[str], analysis_duration: float,
+              timestamp: datetime) -> 'AnalysisResult':
+        """
+        Construtor rápido para uso interno dos analisadores
+        
+        Atribui os campos diretamente, sem o binding de argumentos do __init__
+        gerado nem __post_init__; por isso todos os campos, inclusive
+        timestamp, são obrigatórios.
+        """
+        self = cls.__new__(cls)
+        self.file_path = file_path
+        self.file_name = file_name
+        self.file_size = file_size
+        self.file_type = file_type
+        self.analysis_type = analysis_type
+        self.metadata = metadata
+        self.success = success
+        self.error_message = error_message
+        self.analysis_duration = analysis_duration
+        self.timestamp = timestamp
+        return self
+    
     def to_dict(self) -> Dict[str, Any]:
-        """Converte resultado para dicionário"""
-        return {
-            'file_path': self.file_path,
-            'file_name': self.file_name,
-            'file_size': self.file_size,
-            'file_type': self.file_type,
-            'analysis_type': self.analysis_type,
-            'metadata': self.metadata,
-            'success': self.success,
-            'error_message': self.error_message,
-            'analysis_duration': self.analysis_duration,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None
-        }
+        """
+        Converte resultado para dicionário
+        
+        O timestamp é emitido como segundos desde a época (float), pronto para
+        serialização JSON/SQLite; a formatação fica a cargo da apresentação.
+        """
+        result = dict(zip(_RESULT_FIELDS, _get_result_fields(self)))
+        result['timestamp'] = self.timestamp.timestamp() if self.timestamp else None
+        return result
+    
+    def to_dict_iso(self) -> Dict[str, Any]:
+        """Converte resultado para dicionário com timestamp em ISO 8601"""
+        result = dict(zip(_RESULT_FIELDS, _get_result_fields(self)))
+        result['timestamp'] = self.timestamp.isoformat() if self.timestamp else None
+        return result
 
 
 class BaseAnalyzer(ABC):
@@ -58,7 +173,8 @@ class BaseAnalyzer(ABC):
             supported_extensions: Extensões suportadas (com ponto, ex: '.jpg')
         """
         self.name = name
-        self.supported_extensions = {ext.lower() for ext in supported_extensions}
+        # Imutável: get_supported_extensions pode devolvê-lo sem cópia
+        self.supported_extensions: FrozenSet[str] = frozenset(ext.lower() for ext in supported_extensions)
         self.logger = logging.getLogger(f"{__name__}.{name}")
     
     def can_analyze(self, file_path: Path) -> bool:
@@ -72,12 +188,15 @@ class BaseAnalyzer(ABC):
             True se pode analisar
         """
         try:
-            extension = file_path.suffix.lower()
-            return extension in self.supported_extensions
+            return self._can_analyze_ext(file_path.suffix.lower())
         except Exception as e:
             self.logger.debug(f"Erro ao verificar extensão de {file_path}: {e}")
             return False
     
+    def _can_analyze_ext(self, extension: str) -> bool:
+        """Verifica suporte a uma extensão já normalizada (minúscula, com ponto)"""
+        return extension in self.supported_extensions
+    
     def analyze(self, file_path: Path) -> AnalysisResult:
         """
         Analisa um arquivo e retorna resultado
@@ -88,61 +207,244 @@ class BaseAnalyzer(ABC):
         Returns:
             Resultado da análise
         """
+        start_ns = time.perf_counter_ns()
         start_time = datetime.now()
         
+        file_stat = None
+        extension = file_path.suffix.lower()
+        file_type = self._get_file_type_ext(extension)
+        
+        # Calculados uma única vez e reaproveitados em todos os caminhos
+        abs_path = str(file_path.absolute())
+        file_name = file_path.name
+        
         try:
-            # Verificações básicas
-            if not file_path.exists():
-                return self._create_error_result(
-                    file_path, "Arquivo não encontrado"
+            # Verificações básicas (um único stat() por arquivo)
+            try:
+                file_stat = file_path.stat()
+            except FileNotFoundError:
+                return self._make_result(
+                    abs_path, "unknown", 0, file_type, {}, False,
+                    "Arquivo não encontrado", timestamp=start_time
                 )
             
-            if not file_path.is_file():
-                return self._create_error_result(
-                    file_path, "Não é um arquivo"
+            if not stat.S_ISREG(file_stat.st_mode):
+                return self._make_result(
+                    abs_path, file_name, file_stat.st_size, file_type, {}, False,
+                    "Não é um arquivo", timestamp=start_time
                 )
             
-            if not self.can_analyze(file_path):
-                return self._create_error_result(
-                    file_path, f"Extensão não suportada pelo {self.name}"
+            # Verificação rápida pela extensão; can_analyze() só é consultado
+            # quando ela falha, para respeitar subclasses que a sobrescrevem
+            if not self._can_analyze_ext(extension) and not self.can_analyze(file_path):
+                return self._make_result(
+                    abs_path, file_name, file_stat.st_size, file_type, {}, False,
+                    f"Extensão não suportada pelo {self.name}", timestamp=start_time
                 )
             
             # Executar análise específica
             metadata = self._analyze_file(file_path)
             
             # Calcular duração
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - start_ns) * 1e-9
             
             # Criar resultado de sucesso
-            return AnalysisResult(
-                file_path=str(file_path.absolute()),
-                file_name=file_path.name,
-                file_size=file_path.stat().st_size,
-                file_type=self._get_file_type(file_path),
-                analysis_type=self.name,
-                metadata=metadata,
-                success=True,
-                analysis_duration=duration,
-                timestamp=start_time
+            return self._make_result(
+                abs_path, file_name, file_stat.st_size, file_type, metadata, True,
+                duration=duration, timestamp=start_time
             )
             
         except Exception as e:
             self.logger.error(f"Erro na análise de {file_path}: {e}")
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = (time.perf_counter_ns() - start_ns) * 1e-9
             
-            return AnalysisResult(
-                file_path=str(file_path.absolute()),
-                file_name=file_path.name if file_path.exists() else "unknown",
-                file_size=file_path.stat().st_size if file_path.exists() else 0,
-                file_type=self._get_file_type(file_path),
-                analysis_type=self.name,
-                metadata={},
-                success=False,
-                error_message=str(e),
-                analysis_duration=duration,
-                timestamp=start_time
+            return self._make_result(
+                abs_path,
+                file_name if file_stat else "unknown",
+                file_stat.st_size if file_stat else 0,
+                file_type, {}, False, str(e),
+                duration=duration, timestamp=start_time
             )
     
+    def analyze_many(self, file_paths: Iterable[Path],
+                     max_workers: Optional[int] = None) -> Iterator[AnalysisResult]:
+        """
+        Analisa vários arquivos em paralelo
+        
+        A extração é dominada por I/O e por bibliotecas em C que liberam o
+        GIL, então um pool de threads sobrepõe as leituras de disco.
+        
+        Args:
+            file_paths: Caminhos dos arquivos
+            max_workers: Número máximo de threads (padrão: número de CPUs)
+            
+        Yields:
+            Resultados na mesma ordem dos caminhos recebidos
+        """
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                thread_name_prefix=f"{self.name}-batch") as executor:
+            yield from executor.map(self.analyze, file_paths)
+    
+    def _prepare_worker(self) -> None:
+        """
+        Ajusta o processo do pool criado por _analyze_many_in_processes
+        
+        Chamado uma vez por processo, logo após criar o analisador. Subclasses
+        podem sobrescrever para limitar threads internas de bibliotecas nativas.
+        """
+    
+    def _analyze_many_in_processes(self, file_paths: Iterable[Path],
+                                   max_workers: Optional[int] = None,
+                                   chunksize_cap: int = 8) -> Iterator[AnalysisResult]:
+        """
+        Analisa vários arquivos em processos separados
+        
+        Para analisadores dominados por código Python, que não escalam com
+        threads por causa do GIL. Os arquivos são enviados ao pool já na
+        chamada. Com menos de dois arquivos, ou se não for possível criar o
+        pool, usa o pool de threads de BaseAnalyzer.analyze_many. Nada é
+        analisado no processo atual depois disso: se um processo do pool
+        morrer (por exemplo, falha nativa ao ler um arquivo malformado), o
+        arquivo que ele analisava vira um resultado de erro e os demais seguem
+        em um pool novo.
+        
+        Args:
+            file_paths: Caminhos dos arquivos
+            max_workers: Número máximo de processos (padrão: número de CPUs)
+            chunksize_cap: Maior número de arquivos enviados de uma vez a um processo
+            
+        Returns:
+            Iterador de resultados na mesma ordem dos caminhos recebidos
+        """
+        paths = list(file_paths)
+        if len(paths) < 2:
+            return BaseAnalyzer.analyze_many(self, paths, max_workers)
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        indexes = list(range(len(paths)))
+        try:
+            pool = self._start_process_pool(paths, indexes, workers, chunksize_cap)
+        except (OSError, NotImplementedError) as e:
+            logger.warning(f"Pool de processos indisponível, usando threads: {e}")
+            return BaseAnalyzer.analyze_many(self, paths, max_workers)
+        
+        return self._collect_process_results(pool, paths, indexes, workers, chunksize_cap)
+    
+    def _start_process_pool(self, paths: List[Path], indexes: Sequence[int],
+                            workers: int, chunksize_cap: int):
+        """
+        Cria um pool de processos e envia a ele os arquivos indicados
+        
+        Args:
+            paths: Todos os caminhos do lote
+            indexes: Índices (em ordem crescente) dos caminhos a enviar
+            workers: Número máximo de processos
+            chunksize_cap: Maior número de arquivos enviados de uma vez a um processo
+            
+        Returns:
+            Tupla (pool, lista de (índices, future) por lote, índices em análise)
+        """
+        workers = min(workers, len(indexes))
+        in_flight = multiprocessing.Array('i', [-1] * workers, lock=False)
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_analyzer_worker,
+            initargs=(type(self), in_flight, multiprocessing.Value('i', 0))
+        )
+        
+        # Lotes pequenos o bastante para equilibrar a carga entre os processos
+        chunksize = max(1, min(chunksize_cap, len(indexes) // (workers * 4)))
+        batches = []
+        for start in range(0, len(indexes), chunksize):
+            batch = indexes[start:start + chunksize]
+            items = [(index, paths[index]) for index in batch]
+            batches.append((batch, executor.submit(_analyze_batch_in_worker, items)))
+        return executor, batches, in_flight
+    
+    def _collect_process_results(self, pool, paths: List[Path], indexes: List[int],
+                                 workers: int, chunksize_cap: int) -> Iterator[AnalysisResult]:
+        """
+        Entrega os resultados do pool, recuperando-se da perda de um processo
+        
+        Quando o pool quebra, os lotes já concluídos são aproveitados. Se um
+        único arquivo estava em análise, ele é dado como falho; se eram vários,
+        eles são repetidos um por vez (pool de um processo) para isolar o
+        culpado. Os demais arquivos seguem em um pool novo.
+        
+        Args:
+            pool: Pool já iniciado por _start_process_pool
+            paths: Todos os caminhos do lote
+            indexes: Índices enviados ao pool
+            workers: Número máximo de processos
+            chunksize_cap: Maior número de arquivos enviados de uma vez a um processo
+            
+        Yields:
+            Resultados na mesma ordem dos caminhos
+        """
+        ready: Dict[int, AnalysisResult] = {}
+        position = 0
+        # Rodadas ainda por executar: (índices, número de processos)
+        rounds: List[Tuple[List[int], int]] = []
+        round_workers = workers
+        
+        while pool is not None:
+            executor, batches, in_flight = pool
+            try:
+                with executor:
+                    try:
+                        for batch, future in batches:
+                            ready.update(zip(batch, future.result()))
+                            while position in ready:
+                                yield ready.pop(position)
+                                position += 1
+                    finally:
+                        # Cancela o que ainda não começou se o consumidor parar antes
+                        for _, future in batches:
+                            future.cancel()
+            except BrokenProcessPool as e:
+                for batch, future in batches:
+                    if future.done() and not future.cancelled() and future.exception() is None:
+                        ready.update(zip(batch, future.result()))
+                
+                crashed = sorted(index for index in set(in_flight) if index >= 0)
+                pending = [index for index in indexes if index >= position and index not in ready]
+                logger.error(
+                    f"Processo do pool de {self.name} encerrado inesperadamente ({e}); "
+                    f"arquivos em análise: {[paths[index].name for index in crashed]}"
+                )
+                
+                if len(crashed) > 1:
+                    # Vários suspeitos: repetir um por vez para achar o culpado
+                    retry = [index for index in pending if index not in crashed]
+                    rounds[:0] = [(crashed, 1), (retry, round_workers)]
+                else:
+                    # Sem arquivo identificado (ex: falha ao iniciar o processo),
+                    # repetir poderia não terminar: o restante é dado como falho
+                    failed = crashed or pending
+                    for index in failed:
+                        ready[index] = self._create_error_result(paths[index], _WORKER_CRASH_MESSAGE)
+                    rounds[:0] = [([index for index in pending if index not in failed], round_workers)]
+            
+            while position in ready:
+                yield ready.pop(position)
+                position += 1
+            
+            pool = None
+            while pool is None and rounds:
+                indexes, round_workers = rounds.pop(0)
+                if not indexes:
+                    continue
+                try:
+                    pool = self._start_process_pool(paths, indexes, round_workers, chunksize_cap)
+                except (OSError, NotImplementedError) as e:
+                    logger.error(f"Não foi possível recriar o pool de {self.name}: {e}")
+                    for index in indexes:
+                        ready[index] = self._create_error_result(paths[index], str(e))
+        
+        while position in ready:
+            yield ready.pop(position)
+            position += 1
+    
     @abstractmethod
     def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """
@@ -156,7 +458,8 @@ class BaseAnalyzer(ABC):
         """
         pass
     
-    def _get_file_type(self, file_path: Path) -> str:
+    @staticmethod
+    def _get_file_type(file_path: Path) -> str:
         """
         Determina o tipo do arquivo
         
@@ -167,69 +470,79 @@ class BaseAnalyzer(ABC):
             Tipo do arquivo
         """
         try:
-            extension = file_path.suffix.lower()
-            
-            # Mapeamento básico de extensões para tipos
-            type_mapping = {
-                # Imagens
-                '.jpg': 'JPEG Image', '.jpeg': 'JPEG Image',
-                '.png': 'PNG Image', '.gif': 'GIF Image',
-                '.bmp': 'BMP Image', '.tiff': 'TIFF Image', '.tif': 'TIFF Image',
-                '.webp': 'WebP Image',
-                
-                # Documentos
-                '.pdf': 'PDF Document',
-                '.docx': 'Word Document', '.doc': 'Word Document',
-                '.xlsx': 'Excel Spreadsheet', '.xls': 'Excel Spreadsheet',
-                '.pptx': 'PowerPoint Presentation', '.ppt': 'PowerPoint Presentation',
-                '.txt': 'Text Document', '.rtf': 'Rich Text Document',
-                
-                # Áudio
-                '.mp3': 'MP3 Audio', '.wav': 'WAV Audio',
-                '.flac': 'FLAC Audio', '.m4a': 'M4A Audio',
-                '.aac': 'AAC Audio', '.ogg': 'OGG Audio',
-                
-                # Vídeo
-                '.mp4': 'MP4 Video', '.avi': 'AVI Video',
-                '.mkv': 'MKV Video', '.mov': 'QuickTime Video',
-                '.wmv': 'WMV Video', '.flv': 'FLV Video',
-                
-                # Arquivos
-                '.zip': 'ZIP Archive', '.rar': 'RAR Archive',
-                '.7z': '7-Zip Archive', '.tar': 'TAR Archive',
-                '.gz': 'GZIP Archive'
-            }
-            
-            return type_mapping.get(extension, f"Unknown ({extension})")
-            
+            return BaseAnalyzer._get_file_type_ext(file_path.suffix.lower())
         except Exception:
             return "Unknown"
     
-    def _create_error_result(self, file_path: Path, error_message: str) -> AnalysisResult:
+    @staticmethod
+    def _get_file_type_ext(extension: str) -> str:
+        """Determina o tipo do arquivo a partir da extensão já normalizada"""
+        return FILE_TYPE_MAP.get(extension, f"Unknown ({extension})")
+    
+    def _create_error_result(self, file_path: Path, error_message: str,
+                             file_stat: Optional[os.stat_result] = None) -> AnalysisResult:
         """
         Cria resultado de erro
         
         Args:
             file_path: Caminho do arquivo
             error_message: Mensagem de erro
+            file_stat: Resultado de stat() já obtido, evitando nova consulta ao disco
             
         Returns:
             Resultado com erro
         """
-        return AnalysisResult(
-            file_path=str(file_path.absolute()) if file_path else "unknown",
-            file_name=file_path.name if file_path and file_path.exists() else "unknown",
-            file_size=file_path.stat().st_size if file_path and file_path.exists() else 0,
-            file_type=self._get_file_type(file_path) if file_path else "Unknown",
+        if file_stat is None and file_path:
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                file_stat = None
+        
+        return self._make_result(
+            str(file_path.absolute()) if file_path else "unknown",
+            file_path.name if file_stat else "unknown",
+            file_stat.st_size if file_stat else 0,
+            self._get_file_type(file_path) if file_path else "Unknown",
+            {}, False, error_message
+        )
+    
+    def _make_result(self, abs_path: str, file_name: str, file_size: int,
+                     file_type: str, metadata: Dict[str, Any], success: bool,
+                     error_message: Optional[str] = None, duration: float = 0.0,
+                     timestamp: Optional[datetime] = None) -> AnalysisResult:
+        """
+        Monta o AnalysisResult a partir de valores já calculados
+        
+        Args:
+            abs_path: Caminho absoluto do arquivo
+            file_name: Nome do arquivo
+            file_size: Tamanho em bytes
+            file_type: Tipo do arquivo
+            metadata: Metadados extraídos
+            success: Se a análise foi bem-sucedida
+            error_message: Mensagem de erro, se houver
+            duration: Duração da análise em segundos
+            timestamp: Momento de início da análise
+            
+        Returns:
+            Resultado da análise
+        """
+        return AnalysisResult.build(
+            file_path=abs_path,
+            file_name=file_name,
+            file_size=file_size,
+            file_type=file_type,
             analysis_type=self.name,
-            metadata={},
-            success=False,
-            error_message=error_message
+            metadata=metadata,
+            success=success,
+            error_message=error_message,
+            analysis_duration=duration,
+            timestamp=timestamp or datetime.now()
         )
     
-    def get_supported_extensions(self) -> Set[str]:
-        """Retorna extensões suportadas"""
-        return self.supported_extensions.copy()
+    def get_supported_extensions(self) -> FrozenSet[str]:
+        """Retorna extensões suportadas (conjunto imutável, sem cópia)"""
+        return self.supported_extensions
     
     def get_name(self) -> str:
         """Retorna nome do analisador"""
@@ -252,6 +565,7 @@ class MultiFormatAnalyzer(BaseAnalyzer):
         # Será definido pelas subclasses
         super().__init__(name, set())
         self.format_handlers = {}
+        self._ext_mut: Set[str] = set()
     
     def add_format_handler(self, extensions: Set[str], handler_func):
         """
@@ -261,28 +575,33 @@ class MultiFormatAnalyzer(BaseAnalyzer):
             extensions: Conjunto de extensões
             handler_func: Função para processar esses formatos
         """
-        for ext in extensions:
-            ext_lower = ext.lower()
-            self.supported_extensions.add(ext_lower)
-            self.format_handlers[ext_lower] = handler_func
+        lowered = [ext.lower() for ext in extensions]
+        self._ext_mut.update(lowered)
+        self.format_handlers.update(dict.fromkeys(lowered, handler_func))
+        
+        self.supported_extensions = frozenset(self._ext_mut)
     
     def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
         """Análise usando handler específico para a extensão"""
         extension = file_path.suffix.lower()
         
-        if extension in self.format_handlers:
-            handler = self.format_handlers[extension]
-            return handler(file_path)
-        else:
+        # Uma única consulta ao dicionário extensão -> handler
+        handler = self.format_handlers.get(extension)
+        if handler is None:
             raise ValueError(f"Nenhum handler encontrado para extensão: {extension}")
+        return handler(file_path)
 
 
 class AnalyzerRegistry:
     """Registro de analisadores disponíveis"""
     
     def __init__(self):
-        self._analyzers: List[BaseAnalyzer] = []
-        self._extension_map: Dict[str, List[BaseAnalyzer]] = {}
+        self._analyzers: Dict[str, BaseAnalyzer] = {}
+        # Extensão -> analisador preferido, resolvido no registro (o primeiro vence)
+        self._primary: Dict[str, BaseAnalyzer] = {}
+        # Alternância para extensões compostas (ex: '.tar.gz'), ancorada no fim
+        self._compound_re: Optional[Pattern[str]] = None
+        self._lock = threading.Lock()
     
     def register(self, analyzer: BaseAnalyzer) -> None:
         """
@@ -291,14 +610,21 @@ class AnalyzerRegistry:
         Args:
             analyzer: Instância do analisador
         """
-        if analyzer not in self._analyzers:
-            self._analyzers.append(analyzer)
+        with self._lock:
+            # Um analisador por nome: registros repetidos são ignorados
+            if self._analyzers.setdefault(analyzer.name, analyzer) is not analyzer:
+                return
             
-            # Atualizar mapa de extensões
+            # Atualizar mapa de extensões (já normalizadas pelo BaseAnalyzer)
             for ext in analyzer.get_supported_extensions():
-                if ext not in self._extension_map:
-                    self._extension_map[ext] = []
-                self._extension_map[ext].append(analyzer)
+                self._primary.setdefault(ext, analyzer)
+            
+            compound = sorted((ext for ext in self._primary if ext.count('.') > 1),
+                              key=len, reverse=True)
+            if compound:
+                self._compound_re = re.compile(
+                    '(?:' + '|'.join(map(re.escape, compound)) + ')$', re.IGNORECASE
+                )
     
     def get_analyzer_for_file(self, file_path: Path) -> Optional[BaseAnalyzer]:
         """
@@ -310,23 +636,51 @@ class AnalyzerRegistry:
         Returns:
             Analisador apropriado ou None
         """
-        extension = file_path.suffix.lower()
-        analyzers = self._extension_map.get(extension, [])
+        # Extensões compostas têm precedência sobre o último sufixo
+        if self._compound_re is not None:
+            match = self._compound_re.search(file_path.name)
+            if match:
+                return self._primary[match.group(0).lower()]
+        
+        # O mapa só contém analisadores que declararam a extensão, então não
+        # é preciso consultar can_analyze()
+        return self._primary.get(file_path.suffix.lower())
+    
+    def analyze_many(self, file_paths: Iterable[Path],
+                     max_workers: Optional[int] = None) -> Iterator[AnalysisResult]:
+        """
+        Analisa vários arquivos, cada um com o analisador apropriado
+        
+        Os caminhos são agrupados por analisador antes do processamento, de
+        forma que cada lote usa um único analisador. Arquivos sem analisador
+        registrado são ignorados.
+        
+        Args:
+            file_paths: Caminhos dos arquivos
+            max_workers: Número máximo de threads por lote
+            
+        Yields:
+            Resultados agrupados por analisador
+        """
+        batches: Dict[str, List[Path]] = {}
         
-        # Retornar primeiro analisador que pode processar
-        for analyzer in analyzers:
-            if analyzer.can_analyze(file_path):
-                return analyzer
+        for file_path in file_paths:
+            analyzer = self.get_analyzer_for_file(file_path)
+            if analyzer is None:
+                logger.debug(f"Nenhum analisador registrado para {file_path}")
+                continue
+            batches.setdefault(analyzer.name, []).append(file_path)
         
-        return None
+        for name, paths in batches.items():
+            yield from self._analyzers[name].analyze_many(paths, max_workers)
     
     def get_all_analyzers(self) -> List[BaseAnalyzer]:
         """Retorna todos os analisadores registrados"""
-        return self._analyzers.copy()
+        return list(self._analyzers.values())
     
     def get_supported_extensions(self) -> Set[str]:
         """Retorna todas as extensões suportadas"""
-        return set(self._extension_map.keys())
+        return set(self._primary)
     
     def get_analyzers_by_type(self, analyzer_type: str) -> List[BaseAnalyzer]:
         """
@@ -338,16 +692,20 @@ class AnalyzerRegistry:
         Returns:
             Lista de analisadores do tipo especificado
         """
-        return [a for a in self._analyzers if a.name == analyzer_type]
+        analyzer = self._analyzers.get(analyzer_type)
+        return [analyzer] if analyzer else []
 
 
 # Instância global do registro
 _global_registry: Optional[AnalyzerRegistry] = None
+_registry_lock = threading.Lock()
 
 
 def get_registry() -> AnalyzerRegistry:
-    """Retorna registro global de analisadores"""
+    """Retorna registro global de analisadores (criação thread-safe)"""
     global _global_registry
     if _global_registry is None:
-        _global_registry = AnalyzerRegistry()
+        with _registry_lock:
+            if _global_registry is None:
+                _global_registry = AnalyzerRegistry()
     return _global_registry
@@ -2,40 +2,166 @@
 Analisador especializado para documentos
 """
 
+import codecs
+import importlib
+import importlib.util
+import re
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, Optional, List, Set, Tuple
 import logging
-from datetime import datetime
-from .base import MultiFormatAnalyzer
+from datetime import date, datetime, time, timedelta
+from .base import AnalysisResult, MultiFormatAnalyzer
+
+if TYPE_CHECKING:
+    from PyPDF2 import PdfReader
 
 logger = logging.getLogger(__name__)
 
-# Importações condicionais
-try:
-    import PyPDF2
-    from PyPDF2 import PdfReader
-    PDF_AVAILABLE = True
-except ImportError:
-    PDF_AVAILABLE = False
+# Palavras comuns em diferentes idiomas (detecção básica de idiomas)
+_LANGUAGE_INDICATORS = {
+    'portuguese': ('que', 'para', 'com', 'uma', 'por', 'não', 'são', 'dos', 'mais'),
+    'english': ('the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can'),
+    'spanish': ('que', 'para', 'con', 'una', 'por', 'son', 'los', 'más', 'como'),
+    'french': ('que', 'pour', 'avec', 'une', 'par', 'sont', 'les', 'plus', 'comme'),
+}
+
+# Todos os indicadores compilados em uma única alternância (palavras inteiras)
+_LANGUAGE_PATTERN = re.compile(
+    r'\b(' + '|'.join(sorted(
+        {re.escape(word) for words in _LANGUAGE_INDICATORS.values() for word in words},
+        key=len, reverse=True
+    )) + r')\b'
+)
+
+# Dependências opcionais: a disponibilidade é verificada com find_spec, sem
+# importar os módulos; a importação real só ocorre no primeiro arquivo do formato
+def _module_available(name: str) -> bool:
+    """Verifica se um módulo está instalado sem importá-lo"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _import_optional(name: str):
+    """Importa (uma única vez) um módulo opcional no primeiro uso"""
+    return importlib.import_module(name)
+
+
+PDF_AVAILABLE = _module_available('PyPDF2')
+
+# PyMuPDF (backend preferido para PDF, extração de texto em C); versões
+# anteriores à 1.24 só expõem o módulo como 'fitz'
+FITZ_MODULE = 'pymupdf' if _module_available('pymupdf') else 'fitz'
+FITZ_AVAILABLE = _module_available(FITZ_MODULE)
+
+DOCX_AVAILABLE = _module_available('docx')
+EXCEL_AVAILABLE = _module_available('openpyxl')
+PPTX_AVAILABLE = _module_available('pptx')
+
+# Leitura do texto de PDFs: para ao atingir o orçamento de caracteres; o limite
+# de páginas só protege PDFs sem texto extraível (ex: digitalizados)
+_PDF_TEXT_BUDGET = 4000
+_PDF_MAX_TEXT_PAGES = 50
+
+# Chaves de doc.metadata do PyMuPDF -> entradas do dicionário /Info (sem a
+# barra), como expostas pelo PyPDF2
+_FITZ_INFO_KEYS = {
+    'title': 'Title',
+    'author': 'Author',
+    'subject': 'Subject',
+    'keywords': 'Keywords',
+    'creator': 'Creator',
+    'producer': 'Producer',
+    'creationDate': 'CreationDate',
+    'modDate': 'ModDate',
+    'trapped': 'Trapped',
+}
+
+# Indícios de URL em texto, sem diferenciar maiúsculas (evita copiar o texto
+# inteiro com lower())
+_URL_HINT_PATTERN = re.compile(r'http|www\.', re.IGNORECASE)
 
-try:
-    import docx
-    from docx.opc.coreprops import CoreProperties
-    DOCX_AVAILABLE = True
-except ImportError:
-    DOCX_AVAILABLE = False
+# Bits de permissão do PDF (entrada /P do dicionário /Encrypt)
+_PDF_PERMISSION_BITS = (
+    (4, 'print'),
+    (8, 'modify'),
+    (16, 'copy'),
+    (32, 'add_annotations'),
+    (256, 'fill_forms'),
+    (512, 'extract_for_accessibility'),
+    (1024, 'assemble'),
+    (2048, 'print_high_quality'),
+)
 
-try:
-    import openpyxl
-    EXCEL_AVAILABLE = True
-except ImportError:
-    EXCEL_AVAILABLE = False
+# Bits dos tipos de valor mais comuns em células do Excel
+_EXCEL_TYPE_BITS = {
+    int: 1,
+    float: 2,
+    str: 4,
+    bool: 8,
+    datetime: 16,
+    date: 32,
+    time: 64,
+    timedelta: 128,
+}
 
-try:
-    import pptx
-    PPTX_AVAILABLE = True
-except ImportError:
-    PPTX_AVAILABLE = False
+# Elementos e atributos WordprocessingML lidos diretamente via lxml.
+# O python-docx e o python-pptx já fazem o parsing com um XMLParser próprio
+# (resolve_entities=False), então o parser padrão do lxml não é alterado; as
+# consultas usam nomes Clark com find()/iter(), cujos caminhos o lxml compila
+# e mantém em cache, dispensando objetos etree.XPath
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_W_P = _W + 'p'
+_W_TBL = _W + 'tbl'
+_W_T = _W + 't'
+_W_TAB = _W + 'tab'
+_W_BR = _W + 'br'
+_W_CR = _W + 'cr'
+_W_STYLE = _W + 'style'
+_W_NAME = _W + 'name'
+_W_PSTYLE_PATH = f'{_W}pPr/{_W}pStyle'
+_W_VAL = _W + 'val'
+_W_TYPE = _W + 'type'
+_W_DEFAULT = _W + 'default'
+_W_STYLE_ID = _W + 'styleId'
+_W_SPECIAL_CHARS = {_W_TAB: '\t', _W_BR: '\n', _W_CR: '\n'}
+
+# Nomes internos de estilos do Word com nome de interface diferente
+_WORD_STYLE_UI_NAMES = {'caption': 'Caption', 'footer': 'Footer', 'header': 'Header'}
+_WORD_STYLE_UI_NAMES.update({f'heading {level}': f'Heading {level}' for level in range(1, 10)})
+
+# Tipo do relacionamento slide -> layout no pacote OPC do PowerPoint
+_RT_SLIDE_LAYOUT = (
+    'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout'
+)
+
+# Detecção de encoding de arquivos de texto (opcional)
+CHARSET_NORMALIZER_AVAILABLE = _module_available('charset_normalizer')
+
+# Estatísticas de texto vetorizadas (opcional); abaixo do limiar o custo de
+# montar os arrays supera o ganho
+NUMPY_AVAILABLE = _module_available('numpy')
+_NUMPY_TEXT_THRESHOLD = 64 * 1024
+
+# Code points tratados como quebra de linha por str.splitlines()
+_LINE_BREAK_CODES = (0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x85, 0x2028, 0x2029)
+
+# Code points tratados como espaço por str.split() (todos estão abaixo de U+3001)
+_CHAR_CLASS_LIMIT = 0x3001
+_WHITESPACE_CODES = tuple(code for code in range(_CHAR_CLASS_LIMIT) if chr(code).isspace())
+
+# BOMs reconhecidos em arquivos de texto, em ordem de verificação
+_TEXT_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
 
 
 class DocumentAnalyzer(MultiFormatAnalyzer):
@@ -45,7 +171,7 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         super().__init__("DocumentAnalyzer")
         
         # Registrar handlers para diferentes formatos
-        if PDF_AVAILABLE:
+        if FITZ_AVAILABLE or PDF_AVAILABLE:
             self.add_format_handler({'.pdf'}, self._analyze_pdf)
         
         if DOCX_AVAILABLE:
@@ -61,8 +187,8 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         self.add_format_handler({'.txt', '.rtf', '.csv'}, self._analyze_text)
         
         # Log de disponibilidade
-        if not PDF_AVAILABLE:
-            logger.warning("PyPDF2 não disponível - análise de PDF desabilitada")
+        if not (FITZ_AVAILABLE or PDF_AVAILABLE):
+            logger.warning("PyMuPDF/PyPDF2 não disponível - análise de PDF desabilitada")
         if not DOCX_AVAILABLE:
             logger.warning("python-docx não disponível - análise de Word desabilitada")
         if not EXCEL_AVAILABLE:
@@ -70,6 +196,23 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         if not PPTX_AVAILABLE:
             logger.warning("python-pptx não disponível - análise de PowerPoint desabilitada")
     
+    def analyze_many(self, file_paths: Iterable[Path],
+                     max_workers: Optional[int] = None) -> Iterator[AnalysisResult]:
+        """
+        Analisa vários documentos em paralelo, em processos separados
+        
+        A análise de Word, Excel, PowerPoint e texto é dominada por código
+        Python, então threads não escalam por causa do GIL.
+        
+        Args:
+            file_paths: Caminhos dos arquivos
+            max_workers: Número máximo de processos (padrão: número de CPUs)
+            
+        Returns:
+            Iterador de resultados na mesma ordem dos caminhos recebidos
+        """
+        return self._analyze_many_in_processes(file_paths, max_workers)
+    
     def _analyze_pdf(self, file_path: Path) -> Dict[str, Any]:
         """Análise específica para arquivos PDF"""
         metadata = {
@@ -82,9 +225,12 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
             'structure_info': {}
         }
         
+        if FITZ_AVAILABLE:
+            return self._analyze_pdf_fitz(file_path, metadata)
+        
         try:
             with open(file_path, 'rb') as file:
-                reader = PdfReader(file)
+                reader = _import_optional('PyPDF2').PdfReader(file)
                 
                 # Informações básicas
                 metadata['pages'] = len(reader.pages)
@@ -114,37 +260,204 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return metadata
     
-    def _analyze_pdf_content(self, reader: PdfReader, max_pages: int = 5) -> Dict[str, Any]:
-        """Análise do conteúdo textual do PDF"""
+    def _analyze_pdf_fitz(self, file_path: Path, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Análise de PDF usando PyMuPDF"""
+        try:
+            with _import_optional(FITZ_MODULE).open(file_path) as doc:
+                # Informações básicas
+                metadata['pages'] = doc.page_count
+                metadata['encrypted'] = doc.is_encrypted
+                
+                # Metadados do documento
+                doc_metadata = self._read_pdf_info_fitz(doc)
+                if doc_metadata:
+                    metadata['metadata'] = doc_metadata
+                
+                # Análise de conteúdo (primeiras páginas)
+                metadata['text_content'] = self._analyze_pdf_content(doc)
+                
+                # Informações de segurança
+                metadata['security_info'] = self._analyze_pdf_security_fitz(doc)
+                
+                # Estrutura do documento
+                metadata['structure_info'] = self._analyze_pdf_structure_fitz(doc)
+                
+        except Exception as e:
+            logger.error(f"Erro na análise PDF {file_path}: {e}")
+            metadata['analysis_error'] = str(e)
+        
+        return metadata
+    
+    def _read_pdf_info_fitz(self, doc) -> Dict[str, Optional[str]]:
+        """
+        Lê o dicionário /Info do PDF no mesmo formato do caminho PyPDF2
+        
+        O doc.metadata do PyMuPDF usa chaves próprias (author, creationDate),
+        sempre presentes, e mistura 'format' e 'encryption'; por isso as
+        entradas são lidas direto do /Info, preservando também chaves
+        personalizadas.
+        
+        Args:
+            doc: Documento PyMuPDF aberto
+            
+        Returns:
+            Dicionário entrada (sem a barra) -> valor
+        """
+        info_type, info_ref = doc.xref_get_key(-1, 'Info')
+        if info_type == 'xref':
+            xref = int(info_ref.split()[0])
+            doc_metadata = {}
+            for key in doc.xref_get_keys(xref):
+                value = doc.xref_get_key(xref, key)[1]
+                doc_metadata[key] = value or None
+            return doc_metadata
+        
+        # /Info direto no trailer (raro): recorre às chaves padrão do PyMuPDF
+        return {
+            _FITZ_INFO_KEYS[key]: value
+            for key, value in (doc.metadata or {}).items()
+            if key in _FITZ_INFO_KEYS and value
+        }
+    
+    def _iter_pdf_page_texts(self, reader, max_pages: Optional[int]) -> Iterator[str]:
+        """
+        Gera o texto das primeiras páginas do PDF (PyMuPDF ou PyPDF2)
+        
+        As páginas são lidas uma a uma; o texto de cada página pode ser
+        descartado pelo consumidor assim que processado.
+        
+        Args:
+            reader: Documento PyMuPDF ou PdfReader do PyPDF2
+            max_pages: Número máximo de páginas (None para todas)
+        """
+        if FITZ_AVAILABLE and isinstance(reader, _import_optional(FITZ_MODULE).Document):
+            page_count = reader.page_count
+            if max_pages is not None:
+                page_count = min(page_count, max_pages)
+            
+            for i in range(page_count):
+                try:
+                    yield reader.load_page(i).get_text("text")
+                except Exception as e:
+                    logger.debug(f"Erro ao extrair texto da página {i}: {e}")
+            return
+        
+        page_count = len(reader.pages)
+        if max_pages is not None:
+            page_count = min(page_count, max_pages)
+        
+        for i in range(page_count):
+            try:
+                yield reader.pages[i].extract_text()
+            except Exception as e:
+                logger.debug(f"Erro ao extrair texto da página {i}: {e}")
+    
+    def _summarize_texts(self, texts: Iterable[str], sample_size: int = 500,
+                         detect_languages: bool = False) -> Dict[str, Any]:
+        """
+        Estatísticas de um texto dividido em partes, sem concatená-lo por inteiro
+        
+        Cada parte é tratada como seguida de "\n", como na concatenação
+        texto + "\n" parte a parte; apenas os primeiros caracteres são
+        guardados para a amostra.
+        
+        Args:
+            texts: Partes do texto (páginas, parágrafos, etc.)
+            sample_size: Tamanho máximo da amostra de texto
+            detect_languages: Se deve detectar idiomas durante a varredura
+            
+        Returns:
+            Dicionário com total_characters, total_words, sample_text, has_text
+            e, se solicitado, languages_detected
+        """
+        total_chars = 0
+        total_words = 0
+        has_text = False
+        sample_parts = []
+        sample_len = 0
+        indicators = set()
+        
+        for text in texts:
+            # Cada parte conta com o "\n" que a segue
+            total_chars += len(text) + 1
+            total_words += len(text.split())
+            has_text = has_text or bool(text.strip())
+            
+            if sample_len < sample_size:
+                chunk = text[:sample_size - sample_len]
+                sample_parts.append(chunk)
+                sample_len += len(chunk)
+                if sample_len < sample_size:
+                    sample_parts.append("\n")
+                    sample_len += 1
+            
+            if detect_languages:
+                indicators.update(_LANGUAGE_PATTERN.findall(text.lower()))
+        
+        sample_text = "".join(sample_parts)
+        stats = {
+            'total_characters': total_chars,
+            'total_words': total_words,
+            'sample_text': sample_text + "..." if total_chars > sample_size else sample_text,
+            'has_text': has_text
+        }
+        
+        if detect_languages:
+            stats['languages_detected'] = self._languages_from_indicators(indicators)
+        
+        return stats
+    
+    def _analyze_pdf_content(self, reader, text_budget: int = _PDF_TEXT_BUDGET,
+                             max_pages: Optional[int] = _PDF_MAX_TEXT_PAGES) -> Dict[str, Any]:
+        """
+        Análise do conteúdo textual do PDF
+        
+        As páginas são lidas até que o texto acumulado atinja text_budget
+        caracteres: uma página densa já basta, enquanto PDFs esparsos (ex:
+        digitalizados) continuam sendo lidos até juntar texto suficiente para a
+        amostra e a detecção de idioma. Apenas os totais e a amostra de texto
+        são mantidos, então a memória usada não depende do número de páginas.
+        
+        Args:
+            reader: Documento PyMuPDF ou PdfReader do PyPDF2
+            text_budget: Caracteres de texto a partir dos quais a leitura para
+            max_pages: Limite de segurança de páginas lidas (None para todas)
+            
+        Returns:
+            Estatísticas do conteúdo textual
+        """
         content_info = {
             'total_characters': 0,
             'total_words': 0,
             'sample_text': '',
             'languages_detected': [],
-            'has_text': False
+            'has_text': False,
+            'pages_analyzed': 0
         }
         
+        def budgeted_page_texts() -> Iterator[str]:
+            collected = 0
+            for page_text in self._iter_pdf_page_texts(reader, max_pages):
+                content_info['pages_analyzed'] += 1
+                if not page_text:
+                    continue
+                
+                yield page_text
+                collected += len(page_text)
+                if collected >= text_budget:
+                    break
+        
         try:
-            all_text = ""
-            pages_analyzed = min(len(reader.pages), max_pages)
+            stats = self._summarize_texts(budgeted_page_texts(), detect_languages=True)
             
-            for i in range(pages_analyzed):
-                try:
-                    page = reader.pages[i]
-                    page_text = page.extract_text()
-                    if page_text:
-                        all_text += page_text + "\n"
-                except Exception as e:
-                    logger.debug(f"Erro ao extrair texto da página {i}: {e}")
-            
-            if all_text.strip():
+            if stats['has_text']:
                 content_info['has_text'] = True
-                content_info['total_characters'] = len(all_text)
-                content_info['total_words'] = len(all_text.split())
-                content_info['sample_text'] = all_text[:500] + "..." if len(all_text) > 500 else all_text
+                content_info['total_characters'] = stats['total_characters']
+                content_info['total_words'] = stats['total_words']
+                content_info['sample_text'] = stats['sample_text']
                 
                 # Detecção básica de idioma (simplificada)
-                content_info['languages_detected'] = self._detect_languages(all_text)
+                content_info['languages_detected'] = stats['languages_detected']
             
         except Exception as e:
             logger.debug(f"Erro na análise de conteúdo PDF: {e}")
@@ -152,7 +465,7 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return content_info
     
-    def _analyze_pdf_security(self, reader: PdfReader) -> Dict[str, Any]:
+    def _analyze_pdf_security(self, reader: 'PdfReader') -> Dict[str, Any]:
         """Análise de segurança do PDF"""
         security_info = {
             'encrypted': reader.is_encrypted,
@@ -179,7 +492,7 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return security_info
     
-    def _analyze_pdf_structure(self, reader: PdfReader) -> Dict[str, Any]:
+    def _analyze_pdf_structure(self, reader: 'PdfReader') -> Dict[str, Any]:
         """Análise da estrutura do PDF"""
         structure_info = {
             'has_bookmarks': False,
@@ -193,19 +506,79 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
             if hasattr(reader, 'pdf_header'):
                 structure_info['pdf_version'] = reader.pdf_header
             
-            # Bookmarks/Outlines
-            if hasattr(reader, 'outline') and reader.outline:
+            # Bookmarks/Outlines (a árvore é reconstruída a cada acesso)
+            outline = getattr(reader, 'outline', None)
+            if outline:
                 structure_info['has_bookmarks'] = True
-                structure_info['bookmark_count'] = len(reader.outline)
+                structure_info['bookmark_count'] = len(outline)
             
-            # Formulários e anotações (análise básica)
+            # Campos de formulário: /AcroForm é uma entrada do catálogo (/Root),
+            # não das páginas
+            root = reader.trailer.get('/Root')
+            if root is not None and root.get_object().get('/AcroForm') is not None:
+                structure_info['has_forms'] = True
+            
+            # Anotações (análise básica)
             for page in reader.pages[:5]:  # Verificar primeiras 5 páginas
-                if hasattr(page, 'annotations') and page.annotations:
+                if page.get('/Annots'):
                     structure_info['has_annotations'] = True
-                
-                # Verificar se há campos de formulário
-                if '/AcroForm' in str(page):
-                    structure_info['has_forms'] = True
+                    break
+            
+        except Exception as e:
+            logger.debug(f"Erro na análise de estrutura PDF: {e}")
+            structure_info['structure_analysis_error'] = str(e)
+        
+        return structure_info
+    
+    def _analyze_pdf_security_fitz(self, doc) -> Dict[str, Any]:
+        """Análise de segurança do PDF usando PyMuPDF"""
+        security_info = {
+            'encrypted': doc.is_encrypted,
+            'permissions': {},
+            'security_handler': 'unknown'
+        }
+        
+        try:
+            encryption = (doc.metadata or {}).get('encryption')
+            if encryption:
+                security_info['security_handler'] = encryption
+                security_info['permissions'] = self._decode_pdf_permissions(doc.permissions)
+            
+        except Exception as e:
+            logger.debug(f"Erro na análise de segurança PDF: {e}")
+            security_info['security_analysis_error'] = str(e)
+        
+        return security_info
+    
+    def _analyze_pdf_structure_fitz(self, doc) -> Dict[str, Any]:
+        """Análise da estrutura do PDF usando PyMuPDF"""
+        structure_info = {
+            'has_bookmarks': False,
+            'has_forms': False,
+            'has_annotations': False,
+            'pdf_version': 'unknown'
+        }
+        
+        try:
+            # Versão do PDF: 'PDF 1.7' no PyMuPDF, '%PDF-1.7' (cabeçalho) no PyPDF2
+            pdf_format = (doc.metadata or {}).get('format')
+            if pdf_format:
+                structure_info['pdf_version'] = pdf_format.replace('PDF ', '%PDF-', 1)
+            
+            # Bookmarks/Outlines
+            toc = doc.get_toc(simple=True)
+            if toc:
+                structure_info['has_bookmarks'] = True
+                structure_info['bookmark_count'] = len(toc)
+            
+            # Campos de formulário (AcroForm no catálogo do documento)
+            structure_info['has_forms'] = bool(doc.is_form_pdf)
+            
+            # Anotações (primeiras 5 páginas)
+            for i in range(min(doc.page_count, 5)):
+                if doc.load_page(i).first_annot is not None:
+                    structure_info['has_annotations'] = True
+                    break
             
         except Exception as e:
             logger.debug(f"Erro na análise de estrutura PDF: {e}")
@@ -215,17 +588,9 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
     
     def _decode_pdf_permissions(self, permissions: int) -> Dict[str, bool]:
         """Decodifica permissões do PDF"""
-        # Baseado na especificação PDF
-        return {
-            'print': bool(permissions & 4),
-            'modify': bool(permissions & 8),
-            'copy': bool(permissions & 16),
-            'add_annotations': bool(permissions & 32),
-            'fill_forms': bool(permissions & 256),
-            'extract_for_accessibility': bool(permissions & 512),
-            'assemble': bool(permissions & 1024),
-            'print_high_quality': bool(permissions & 2048)
-        }
+        # Baseado na especificação PDF; /P pode vir como NumberObject do PyPDF2
+        permissions = int(permissions)
+        return {name: bool(permissions & mask) for mask, name in _PDF_PERMISSION_BITS}
     
     def _analyze_word(self, file_path: Path) -> Dict[str, Any]:
         """Análise específica para documentos Word"""
@@ -238,7 +603,7 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            doc = docx.Document(file_path)
+            doc = _import_optional('docx').Document(file_path)
             
             # Propriedades do documento
             if doc.core_properties:
@@ -270,9 +635,13 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         return metadata
     
     def _analyze_word_content(self, doc) -> Dict[str, Any]:
-        """Análise do conteúdo do documento Word"""
+        """Análise do conteúdo do documento Word (direto sobre o XML do corpo)"""
+        body = doc.element.body
+        # Mesmos parágrafos de doc.paragraphs, sem criar objetos Paragraph
+        paragraphs = body.findall(_W_P)
+        
         content_stats = {
-            'paragraphs': len(doc.paragraphs),
+            'paragraphs': len(paragraphs),
             'total_characters': 0,
             'total_words': 0,
             'has_tables': False,
@@ -282,19 +651,18 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         try:
             # Contar texto
-            all_text = ""
-            for paragraph in doc.paragraphs:
-                if paragraph.text:
-                    all_text += paragraph.text + "\n"
+            paragraph_texts = (self._word_paragraph_text(p) for p in paragraphs)
+            stats = self._summarize_texts(text for text in paragraph_texts if text)
             
-            content_stats['total_characters'] = len(all_text)
-            content_stats['total_words'] = len(all_text.split())
-            content_stats['sample_text'] = all_text[:500] + "..." if len(all_text) > 500 else all_text
+            content_stats['total_characters'] = stats['total_characters']
+            content_stats['total_words'] = stats['total_words']
+            content_stats['sample_text'] = stats['sample_text']
             
             # Verificar tabelas
-            if doc.tables:
+            table_count = len(body.findall(_W_TBL))
+            if table_count:
                 content_stats['has_tables'] = True
-                content_stats['table_count'] = len(doc.tables)
+                content_stats['table_count'] = table_count
             
             # Verificar imagens (através de relacionamentos)
             if hasattr(doc, 'part') and hasattr(doc.part, 'related_parts'):
@@ -309,6 +677,61 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return content_stats
     
+    def _word_paragraph_text(self, paragraph) -> str:
+        """Texto de um elemento w:p (tabulações e quebras como \\t e \\n)"""
+        return "".join(
+            (node.text or "") if node.tag == _W_T else _W_SPECIAL_CHARS[node.tag]
+            for node in paragraph.iter(_W_T, _W_TAB, _W_BR, _W_CR)
+        )
+    
+    def _word_paragraph_style_names(self, doc, style_ids: Set[Optional[str]]) -> Dict[Optional[str], str]:
+        """
+        Nomes dos estilos de parágrafo solicitados, indexados pelo styleId
+        
+        Apenas os estilos em style_ids são resolvidos e a varredura de
+        styles.xml para assim que todos forem encontrados. A chave None
+        corresponde ao estilo de parágrafo padrão, usado pelos parágrafos sem
+        w:pStyle (ou com um styleId inexistente).
+        
+        Args:
+            doc: Documento do python-docx
+            style_ids: styleIds usados (None para parágrafos sem w:pStyle)
+            
+        Returns:
+            Dicionário styleId -> nome do estilo
+        """
+        style_names = {}
+        pending = set(style_ids)
+        # O padrão é sempre necessário como fallback de styleIds inexistentes
+        pending.add(None)
+        
+        for style in doc.styles.element.iterchildren(_W_STYLE):
+            if not pending:
+                break
+            
+            if style.get(_W_TYPE) != 'paragraph':
+                continue
+            
+            style_id = style.get(_W_STYLE_ID)
+            is_default = None in pending and style.get(_W_DEFAULT) in ('1', 'true', 'on')
+            if style_id not in pending and not is_default:
+                continue
+            
+            name = style.find(_W_NAME)
+            if name is None or not name.get(_W_VAL):
+                continue
+            
+            # Mesmos nomes de interface usados pelo python-docx (ex: "Heading 1")
+            ui_name = _WORD_STYLE_UI_NAMES.get(name.get(_W_VAL), name.get(_W_VAL))
+            if style_id in pending:
+                style_names[style_id] = ui_name
+                pending.discard(style_id)
+            if is_default:
+                style_names[None] = ui_name
+                pending.discard(None)
+        
+        return style_names
+    
     def _analyze_word_structure(self, doc) -> Dict[str, Any]:
         """Análise da estrutura do documento Word"""
         structure_info = {
@@ -320,19 +743,26 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         try:
             # Seções
-            structure_info['sections'] = len(doc.sections)
+            sections = doc.sections
+            structure_info['sections'] = len(sections)
             
             # Headers e footers
-            for section in doc.sections:
+            for section in sections:
                 if section.header.paragraphs or section.footer.paragraphs:
                     structure_info['headers_footers'] = True
                     break
             
-            # Estilos utilizados (simplificado)
-            styles_used = set()
-            for paragraph in doc.paragraphs[:50]:  # Primeiros 50 parágrafos
-                if paragraph.style and paragraph.style.name:
-                    styles_used.add(paragraph.style.name)
+            # Estilos utilizados (simplificado): o styleId de cada parágrafo é
+            # lido do w:pStyle e cada styleId distinto é resolvido uma única vez
+            style_ids = set()
+            for paragraph in islice(doc.element.body.iterchildren(_W_P), 50):  # Primeiros 50 parágrafos
+                p_style = paragraph.find(_W_PSTYLE_PATH)
+                style_ids.add(p_style.get(_W_VAL) if p_style is not None else None)
+            
+            style_names = self._word_paragraph_style_names(doc, style_ids)
+            default_style = style_names.get(None)
+            styles_used = {style_names.get(style_id, default_style) for style_id in style_ids}
+            styles_used.discard(None)
             
             structure_info['styles_used'] = list(styles_used)[:10]  # Top 10
             
@@ -353,22 +783,37 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=False)
-            
-            # Informações do workbook
-            metadata['workbook_info'] = {
-                'worksheet_count': len(workbook.worksheets),
-                'worksheet_names': workbook.sheetnames,
-                'active_sheet': workbook.active.title if workbook.active else None
-            }
-            
-            # Análise das planilhas
-            for sheet in workbook.worksheets:
-                sheet_info = self._analyze_excel_worksheet(sheet)
-                metadata['worksheets'].append(sheet_info)
+            workbook = _import_optional('openpyxl').load_workbook(file_path, read_only=True, data_only=False)
+            try:
+                # Informações do workbook
+                metadata['workbook_info'] = {
+                    'worksheet_count': len(workbook.worksheets),
+                    'worksheet_names': workbook.sheetnames,
+                    'active_sheet': workbook.active.title if workbook.active else None
+                }
+                
+                # Análise das planilhas: uma única passagem por planilha alimenta
+                # tanto as estatísticas da planilha quanto a análise geral de dados
+                data_analysis = {
+                    'total_cells_with_data': 0,
+                    'total_formulas': 0,
+                    'data_types_found': set(),
+                    'has_charts': False,
+                    'has_pivot_tables': False
+                }
+                
+                for sheet in workbook.worksheets:
+                    sheet_info = self._analyze_excel_worksheet(sheet, data_analysis)
+                    metadata['worksheets'].append(sheet_info)
+            finally:
+                # Em modo somente leitura o arquivo fica aberto até o close()
+                workbook.close()
             
-            # Análise geral de dados
-            metadata['data_analysis'] = self._analyze_excel_data(workbook)
+            # Converter os tipos coletados em nomes (lista, para serialização)
+            data_analysis['data_types_found'] = [
+                value_type.__name__ for value_type in data_analysis['data_types_found']
+            ]
+            metadata['data_analysis'] = data_analysis
             
         except Exception as e:
             logger.error(f"Erro na análise Excel {file_path}: {e}")
@@ -376,8 +821,18 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return metadata
     
-    def _analyze_excel_worksheet(self, sheet) -> Dict[str, Any]:
-        """Análise de uma planilha específica"""
+    def _analyze_excel_worksheet(self, sheet, data_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Análise de uma planilha específica
+        
+        Args:
+            sheet: Planilha do openpyxl (modo somente leitura)
+            data_analysis: Contadores gerais do workbook, atualizados com a
+                amostra inicial da planilha (100 linhas x 50 colunas)
+            
+        Returns:
+            Informações da planilha
+        """
         sheet_info = {
             'name': sheet.title,
             'dimensions': f"{sheet.max_row}x{sheet.max_column}",
@@ -388,69 +843,72 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
             'formula_count': 0
         }
         
+        # Células contadas na amostra usada pela análise geral de dados
+        sample_cells = 0
+        sample_formulas = 0
+        
         try:
             # Contar células com dados e fórmulas
             data_cells = 0
             formula_cells = 0
+            # Tipos comuns acumulados como bits; os demais vão para um set
+            types_mask = 0
+            other_types = set()
             
-            # Limitar análise para performance
-            max_rows = min(sheet.max_row, 1000)
-            max_cols = min(sheet.max_column, 100)
+            # Limitar análise para performance (planilhas sem <dimension> no XML
+            # têm max_row/max_column None no modo somente leitura)
+            max_rows = min(sheet.max_row or 1000, 1000)
+            max_cols = min(sheet.max_column or 100, 100)
             
-            for row in sheet.iter_rows(max_row=max_rows, max_col=max_cols):
-                for cell in row:
-                    if cell.value is not None:
-                        data_cells += 1
-                        if isinstance(cell.value, str) and cell.value.startswith('='):
-                            formula_cells += 1
+            # values_only evita a criação de objetos Cell
+            rows = sheet.iter_rows(max_row=max_rows, max_col=max_cols, values_only=True)
+            for row_index, row in enumerate(rows):
+                # Linhas vazias (comuns quando a formatação infla as dimensões
+                # da planilha) são descartadas com uma contagem em C
+                if row.count(None) == len(row):
+                    continue
+                
+                in_sample = row_index < 100
+                for col_index, value in enumerate(row):
+                    if value is None:
+                        continue
+                    
+                    # Com values_only não há Cell.data_type; em modo data_only=False
+                    # as fórmulas chegam como str iniciada por '='
+                    value_type = type(value)
+                    is_formula = value_type is str and value.startswith('=')
+                    data_cells += 1
+                    formula_cells += is_formula
+                    
+                    if in_sample and col_index < 50:
+                        sample_cells += 1
+                        sample_formulas += is_formula
+                        type_bit = _EXCEL_TYPE_BITS.get(value_type)
+                        if type_bit:
+                            types_mask |= type_bit
+                        else:
+                            other_types.add(value_type)
             
             sheet_info['has_data'] = data_cells > 0
             sheet_info['cell_count'] = data_cells
             sheet_info['formula_count'] = formula_cells
             
+            # Decodificar a máscara uma única vez por planilha
+            types_seen = data_analysis['data_types_found']
+            types_seen.update(
+                value_type for value_type, type_bit in _EXCEL_TYPE_BITS.items()
+                if types_mask & type_bit
+            )
+            types_seen.update(other_types)
+            
         except Exception as e:
             logger.debug(f"Erro na análise da planilha {sheet.title}: {e}")
             sheet_info['analysis_error'] = str(e)
         
-        return sheet_info
-    
-    def _analyze_excel_data(self, workbook) -> Dict[str, Any]:
-        """Análise geral dos dados do Excel"""
-        data_analysis = {
-            'total_cells_with_data': 0,
-            'total_formulas': 0,
-            'data_types_found': set(),
-            'has_charts': False,
-            'has_pivot_tables': False
-        }
-        
-        try:
-            for sheet in workbook.worksheets:
-                # Análise limitada para performance
-                max_rows = min(sheet.max_row, 100)
-                max_cols = min(sheet.max_column, 50)
-                
-                for row in sheet.iter_rows(max_row=max_rows, max_col=max_cols):
-                    for cell in row:
-                        if cell.value is not None:
-                            data_analysis['total_cells_with_data'] += 1
-                            
-                            # Tipo de dados
-                            data_type = type(cell.value).__name__
-                            data_analysis['data_types_found'].add(data_type)
-                            
-                            # Fórmulas
-                            if isinstance(cell.value, str) and cell.value.startswith('='):
-                                data_analysis['total_formulas'] += 1
-            
-            # Converter set para list para serialização
-            data_analysis['data_types_found'] = list(data_analysis['data_types_found'])
-            
-        except Exception as e:
-            logger.debug(f"Erro na análise de dados Excel: {e}")
-            data_analysis['data_analysis_error'] = str(e)
+        data_analysis['total_cells_with_data'] += sample_cells
+        data_analysis['total_formulas'] += sample_formulas
         
-        return data_analysis
+        return sheet_info
     
     def _analyze_powerpoint(self, file_path: Path) -> Dict[str, Any]:
         """Análise específica para apresentações PowerPoint"""
@@ -462,7 +920,7 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            presentation = pptx.Presentation(file_path)
+            presentation = _import_optional('pptx').Presentation(file_path)
             
             # Informações da apresentação
             metadata['presentation_info'] = {
@@ -471,13 +929,28 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
                 'slide_masters_count': len(presentation.slide_masters)
             }
             
-            # Análise dos slides
+            # Nomes dos layouts resolvidos uma única vez, indexados pela parte
+            # do layout (objeto persistente, ao contrário dos proxies do pptx)
+            layout_names = {
+                layout.part: layout.name
+                for master in presentation.slide_masters
+                for layout in master.slide_layouts
+            }
+            
+            # Análise dos slides e do conteúdo geral em uma única passagem
+            content_analysis = {
+                'total_text_characters': 0,
+                'total_shapes': 0,
+                'slides_with_images': 0,
+                'slides_with_tables': 0,
+                'common_layouts': {}
+            }
+            
             for i, slide in enumerate(presentation.slides):
-                slide_info = self._analyze_powerpoint_slide(slide, i)
+                slide_info = self._analyze_powerpoint_slide(slide, i, layout_names, content_analysis)
                 metadata['slides'].append(slide_info)
             
-            # Análise geral do conteúdo
-            metadata['content_analysis'] = self._analyze_powerpoint_content(presentation)
+            metadata['content_analysis'] = content_analysis
             
         except Exception as e:
             logger.error(f"Erro na análise PowerPoint {file_path}: {e}")
@@ -485,90 +958,85 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return metadata
     
-    def _analyze_powerpoint_slide(self, slide, slide_number: int) -> Dict[str, Any]:
-        """Análise de um slide específico"""
+    def _get_slide_layout_name(self, slide, layout_names: Dict[Any, str]) -> str:
+        """Nome do layout do slide, usando o cache de nomes quando possível"""
+        try:
+            layout_part = slide.part.part_related_by(_RT_SLIDE_LAYOUT)
+        except KeyError:
+            return 'Unknown'
+        
+        name = layout_names.get(layout_part)
+        if name is None:
+            name = layout_names[layout_part] = layout_part.slide_layout.name
+        return name
+    
+    def _analyze_powerpoint_slide(self, slide, slide_number: int,
+                                  layout_names: Dict[Any, str],
+                                  content_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Análise de um slide específico
+        
+        Args:
+            slide: Slide do python-pptx
+            slide_number: Índice do slide (a partir de 0)
+            layout_names: Cache de nomes de layout por parte do layout
+            content_analysis: Contadores gerais da apresentação, atualizados
+                com os dados deste slide
+            
+        Returns:
+            Informações do slide
+        """
+        shapes = slide.shapes
+        layout_name = self._get_slide_layout_name(slide, layout_names)
         slide_info = {
             'slide_number': slide_number + 1,
-            'layout_name': slide.slide_layout.name if slide.slide_layout else 'Unknown',
-            'shape_count': len(slide.shapes),
+            'layout_name': layout_name,
+            'shape_count': len(shapes),
             'has_text': False,
             'has_images': False,
             'has_tables': False,
             'text_content': ''
         }
         
+        common_layouts = content_analysis['common_layouts']
+        common_layouts[layout_name] = common_layouts.get(layout_name, 0) + 1
+        content_analysis['total_shapes'] += slide_info['shape_count']
+        
         try:
-            all_text = ""
+            texts = []
+            
+            picture_class = _import_optional('pptx.shapes.picture').Picture
             
-            for shape in slide.shapes:
-                # Texto
-                if hasattr(shape, 'text') and shape.text:
-                    all_text += shape.text + "\n"
-                    slide_info['has_text'] = True
+            for shape in shapes:
+                # Texto: has_text_frame evita que shape.text crie um txBody
+                # vazio em formas sem texto
+                if shape.has_text_frame:
+                    text = shape.text_frame.text
+                    if text:
+                        texts.append(text)
+                        slide_info['has_text'] = True
                 
-                # Imagens
-                if hasattr(shape, 'image'):
+                # Imagens (sem carregar o blob, como shape.image faria)
+                if isinstance(shape, picture_class):
                     slide_info['has_images'] = True
                 
-                # Tabelas
-                if hasattr(shape, 'table'):
+                # Tabelas (shape.table levanta ValueError em gráficos)
+                if shape.has_table:
                     slide_info['has_tables'] = True
             
+            all_text = "\n".join(texts)
             slide_info['text_content'] = all_text[:300] + "..." if len(all_text) > 300 else all_text
             
+            content_analysis['total_text_characters'] += sum(map(len, texts))
+            content_analysis['slides_with_images'] += slide_info['has_images']
+            content_analysis['slides_with_tables'] += slide_info['has_tables']
+            
         except Exception as e:
             logger.debug(f"Erro na análise do slide {slide_number}: {e}")
             slide_info['analysis_error'] = str(e)
         
         return slide_info
     
-    def _analyze_powerpoint_content(self, presentation) -> Dict[str, Any]:
-        """Análise geral do conteúdo da apresentação"""
-        content_analysis = {
-            'total_text_characters': 0,
-            'total_shapes': 0,
-            'slides_with_images': 0,
-            'slides_with_tables': 0,
-            'common_layouts': {}
-        }
-        
-        try:
-            layout_count = {}
-            
-            for slide in presentation.slides:
-                content_analysis['total_shapes'] += len(slide.shapes)
-                
-                # Layout
-                layout_name = slide.slide_layout.name if slide.slide_layout else 'Unknown'
-                layout_count[layout_name] = layout_count.get(layout_name, 0) + 1
-                
-                # Conteúdo
-                has_images = False
-                has_tables = False
-                
-                for shape in slide.shapes:
-                    if hasattr(shape, 'text') and shape.text:
-                        content_analysis['total_text_characters'] += len(shape.text)
-                    
-                    if hasattr(shape, 'image'):
-                        has_images = True
-                    
-                    if hasattr(shape, 'table'):
-                        has_tables = True
-                
-                if has_images:
-                    content_analysis['slides_with_images'] += 1
-                if has_tables:
-                    content_analysis['slides_with_tables'] += 1
-            
-            content_analysis['common_layouts'] = layout_count
-            
-        except Exception as e:
-            logger.debug(f"Erro na análise de conteúdo PowerPoint: {e}")
-            content_analysis['content_analysis_error'] = str(e)
-        
-        return content_analysis
-    
     def _analyze_text(self, file_path: Path) -> Dict[str, Any]:
         """Análise para arquivos de texto simples"""
         metadata = {
@@ -579,41 +1047,26 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            # Detectar encoding
-            encodings_to_try = ['utf-8', 'latin-1', 'cp1252', 'iso-8859-1']
-            content = ""
-            used_encoding = 'unknown'
-            
-            for encoding in encodings_to_try:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                    used_encoding = encoding
-                    break
-                except UnicodeDecodeError:
-                    continue
+            # Ler o arquivo uma única vez e detectar o encoding sobre os bytes
+            raw = file_path.read_bytes()
+            used_encoding, content = self._decode_text(raw)
+            # Normalizar quebras de linha como o open() em modo texto fazia
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             metadata['encoding'] = used_encoding
             
             if content:
                 # Estatísticas básicas
-                lines = content.splitlines()
-                words = content.split()
-                
-                metadata['content_stats'] = {
-                    'total_characters': len(content),
-                    'total_lines': len(lines),
-                    'total_words': len(words),
-                    'average_line_length': sum(len(line) for line in lines) / len(lines) if lines else 0,
-                    'empty_lines': sum(1 for line in lines if not line.strip()),
-                    'max_line_length': max(len(line) for line in lines) if lines else 0
-                }
+                if NUMPY_AVAILABLE and len(content) >= _NUMPY_TEXT_THRESHOLD:
+                    metadata['content_stats'] = self._compute_text_stats_numpy(content)
+                else:
+                    metadata['content_stats'] = self._compute_text_stats(content)
                 
                 # Análise de texto
                 metadata['text_analysis'] = {
                     'sample_text': content[:500] + "..." if len(content) > 500 else content,
                     'languages_detected': self._detect_languages(content),
-                    'has_urls': 'http' in content.lower() or 'www.' in content.lower(),
+                    'has_urls': _URL_HINT_PATTERN.search(content) is not None,
                     'has_emails': '@' in content and '.' in content
                 }
             
@@ -623,32 +1076,119 @@ class DocumentAnalyzer(MultiFormatAnalyzer):
         
         return metadata
     
+    def _compute_text_stats(self, content: str) -> Dict[str, Any]:
+        """Estatísticas de linhas e palavras de um texto"""
+        lines = content.splitlines()
+        words = content.split()
+        
+        return {
+            'total_characters': len(content),
+            'total_lines': len(lines),
+            'total_words': len(words),
+            'average_line_length': sum(len(line) for line in lines) / len(lines) if lines else 0,
+            'empty_lines': sum(1 for line in lines if not line.strip()),
+            'max_line_length': max(len(line) for line in lines) if lines else 0
+        }
+    
+    def _compute_text_stats_numpy(self, content: str) -> Dict[str, Any]:
+        """
+        Mesmas estatísticas de _compute_text_stats, vetorizadas com NumPy
+        
+        O texto é tratado como um array de code points, de modo que as quebras
+        de linha e os espaços seguem exatamente str.splitlines() e str.split().
+        """
+        np = _import_optional('numpy')
+        
+        codes = np.frombuffer(content.encode('utf-32-le'), dtype=np.uint32)
+        size = codes.size
+        
+        # Tabela de classes de caractere indexada pelo code point; todos os
+        # espaços e quebras estão abaixo de _CHAR_CLASS_LIMIT
+        char_class = np.zeros(_CHAR_CLASS_LIMIT + 1, dtype=np.uint8)
+        char_class[list(_WHITESPACE_CODES)] = 1
+        char_class[list(_LINE_BREAK_CODES)] = 3
+        classes = char_class[np.minimum(codes, _CHAR_CLASS_LIMIT)]
+        
+        # Quebras de linha; em "\r\n" apenas o "\r" conta como quebra
+        breaks_mask = classes == 3
+        crlf = (codes[:-1] == 0x0D) & (codes[1:] == 0x0A)
+        breaks_mask[1:] &= ~crlf
+        breaks = np.flatnonzero(breaks_mask)
+        separator_len = 1 + np.isin(breaks, np.flatnonzero(crlf))
+        
+        starts = np.concatenate(([0], breaks + separator_len))
+        ends = np.concatenate((breaks, [size]))
+        if starts[-1] == size:
+            # Quebra final não gera uma linha vazia extra (como splitlines)
+            starts, ends = starts[:-1], ends[:-1]
+        line_lengths = ends - starts
+        
+        # Palavras: sequências de caracteres que não são espaço
+        not_space = classes == 0
+        total_words = int(not_space[0]) + int(np.count_nonzero(not_space[1:] & ~not_space[:-1]))
+        
+        # Linhas vazias: sem nenhum caractere que não seja espaço
+        not_space_cumsum = np.concatenate(([0], np.cumsum(not_space, dtype=np.int64)))
+        empty_lines = int(np.count_nonzero(not_space_cumsum[ends] == not_space_cumsum[starts]))
+        
+        total_lines = int(line_lengths.size)
+        return {
+            'total_characters': len(content),
+            'total_lines': total_lines,
+            'total_words': total_words,
+            'average_line_length': float(line_lengths.mean()) if total_lines else 0,
+            'empty_lines': empty_lines,
+            'max_line_length': int(line_lengths.max()) if total_lines else 0
+        }
+    
+    def _decode_text(self, raw: bytes) -> Tuple[str, str]:
+        """
+        Detecta o encoding e decodifica o conteúdo de um arquivo de texto
+        
+        Args:
+            raw: Conteúdo do arquivo em bytes
+            
+        Returns:
+            Tupla (encoding usado, texto decodificado)
+        """
+        # Marcas de ordem de bytes (BOM); UTF-32 antes de UTF-16, que é prefixo
+        for bom, encoding in _TEXT_BOMS:
+            if raw.startswith(bom):
+                return encoding, raw.decode(encoding, errors='replace')
+        
+        # Caso mais comum: UTF-8 (inclui ASCII)
+        try:
+            return 'utf-8', raw.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+        
+        if CHARSET_NORMALIZER_AVAILABLE:
+            best = _import_optional('charset_normalizer').from_bytes(raw).best()
+            if best is not None:
+                return best.encoding, str(best)
+        
+        # latin-1 decodifica qualquer sequência de bytes
+        return 'latin-1', raw.decode('latin-1')
+    
     def _detect_languages(self, text: str) -> List[str]:
         """Detecção básica de idiomas (simplificada)"""
         # Implementação muito básica - pode ser melhorada com bibliotecas especializadas
-        languages = []
-        
         try:
-            text_lower = text.lower()
-            
-            # Palavras comuns em diferentes idiomas
-            language_indicators = {
-                'portuguese': ['que', 'para', 'com', 'uma', 'por', 'não', 'são', 'dos', 'mais'],
-                'english': ['the', 'and', 'for', 'are', 'but', 'not', 'you', 'all', 'can'],
-                'spanish': ['que', 'para', 'con', 'una', 'por', 'son', 'los', 'más', 'como'],
-                'french': ['que', 'pour', 'avec', 'une', 'par', 'sont', 'les', 'plus', 'comme']
-            }
+            # Uma única varredura do texto encontra todos os indicadores
+            languages = self._languages_from_indicators(
+                set(_LANGUAGE_PATTERN.findall(text.lower()))
+            )
             
-            for language, indicators in language_indicators.items():
-                score = sum(1 for word in indicators if word in text_lower)
-                if score >= 3:  # Threshold arbitrário
-                    languages.append(language)
-            
-            if not languages:
-                languages.append('unknown')
-                
         except Exception as e:
             logger.debug(f"Erro na detecção de idiomas: {e}")
             languages = ['unknown']
         
         return languages
+    
+    def _languages_from_indicators(self, found: Set[str]) -> List[str]:
+        """Idiomas cujos indicadores encontrados atingem o limiar"""
+        languages = [
+            language for language, indicators in _LANGUAGE_INDICATORS.items()
+            if len(found.intersection(indicators)) >= 3  # Threshold arbitrário
+        ]
+        return languages or ['unknown']
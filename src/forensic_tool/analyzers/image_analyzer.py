@@ -2,8 +2,10 @@
 Analisador especializado para imagens
 """
 
+import io
+from bisect import bisect_left
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import logging
 from datetime import datetime
 from .base import BaseAnalyzer
@@ -16,6 +18,12 @@ try:
 except ImportError:
     PIL_AVAILABLE = False
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 try:
     import cv2
     CV2_AVAILABLE = True
@@ -25,6 +33,102 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _decode_exif_bytes(value: bytes) -> str:
+    return value.decode('utf-8', errors='ignore')
+
+
+def _convert_exif_scalar(value: Any) -> Any:
+    """Conversão de valores EXIF fora da tabela (subclasses e outros tipos)"""
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, bytes):
+        return _decode_exif_bytes(value)
+    return str(value)
+
+
+# Conversão dos tipos EXIF mais comuns, indexada pelo tipo exato do valor
+_EXIF_CONVERTERS = {
+    str: _identity,
+    int: _identity,
+    float: _identity,
+    bool: _identity,
+    bytes: _decode_exif_bytes,
+}
+
+# Tags EXIF separadas das demais no resultado, por categoria
+_CAMERA_TAGS = frozenset({'Make', 'Model', 'Software'})
+_TECHNICAL_TAGS = frozenset({
+    'DateTime', 'DateTimeOriginal', 'DateTimeDigitized',
+    'ExposureTime', 'FNumber', 'ISO', 'FocalLength'
+})
+_EXIF_TAG_BUCKETS = {
+    **{name: 'camera' for name in _CAMERA_TAGS},
+    **{name: 'technical' for name in _TECHNICAL_TAGS},
+}
+
+# Referências GPS que tornam a coordenada negativa (hemisférios sul e oeste)
+_GPS_NEGATIVE_REFS = frozenset({'S', 'W'})
+
+# Ponteiros do IFD0 para os sub-IFDs Exif e GPS
+_EXIF_IFD_POINTER = 0x8769
+_GPS_IFD_POINTER = 0x8825
+
+# Tags do IFD0 de um TIFF que descrevem a origem da imagem (as demais
+# descrevem a estrutura dos pixels e não são EXIF)
+_TIFF_DESCRIPTIVE_TAGS = frozenset({
+    0x010D,  # DocumentName
+    0x010E,  # ImageDescription
+    0x010F,  # Make
+    0x0110,  # Model
+    0x0131,  # Software
+    0x0132,  # DateTime
+    0x013B,  # Artist
+    0x013C,  # HostComputer
+    0x8298,  # Copyright
+})
+
+# Limites de bytes por pixel (exclusivos) e rótulos de qualidade estimada
+_QUALITY_THRESHOLDS = (1.5, 3.0)
+_QUALITY_LABELS = ('low', 'medium', 'high')
+
+# Tamanho mínimo pedido ao libjpeg quando só as cores dominantes são necessárias
+_COLOR_DRAFT_SIZE = (100, 100)
+
+# Etapas da análise de imagens, combináveis como bits
+_STAGE_PIL = 1
+_STAGE_HISTOGRAM = 2
+_STAGE_EDGES = 4
+_STAGE_SHARPNESS = 8
+_STAGE_QUALITY = 16
+_OPENCV_STAGES = _STAGE_HISTOGRAM | _STAGE_EDGES | _STAGE_SHARPNESS
+_FULL_PIPELINE = _STAGE_PIL | _OPENCV_STAGES | _STAGE_QUALITY
+
+# Formatos em que as métricas do OpenCV não compensam: ícones minúsculos,
+# GIFs de paleta e PSDs em camadas (que o OpenCV não decodifica)
+_FORMAT_PIPELINE = {
+    '.ico': _STAGE_PIL | _STAGE_QUALITY,
+    '.gif': _STAGE_PIL | _STAGE_QUALITY,
+    '.psd': _STAGE_PIL | _STAGE_QUALITY,
+}
+
+# Maior dimensão usada nas análises de bordas e nitidez
+_ANALYSIS_MAX_DIMENSION = 1024
+
+# Nomes dos canais de cor na ordem do OpenCV (BGR)
+_HISTOGRAM_CHANNELS = ('blue', 'green', 'red')
+
+# Modos PIL cujos pixels o OpenCV usa diretamente (após reordenar os canais)
+_OPENCV_NATIVE_MODES = frozenset({'L', 'RGB', 'RGBA', 'I;16'})
+
+# Modos que cv2.imread(IMREAD_UNCHANGED) também expande para BGR(A): paletas
+# (PNG/GIF) e escala de cinza com alfa (PNG)
+_OPENCV_EXPANDED_MODES = frozenset({'P', 'PA', 'LA', 'La'})
+
+
 class ImageAnalyzer(BaseAnalyzer):
     """Analisador avançado para imagens"""
     
@@ -41,9 +145,27 @@ class ImageAnalyzer(BaseAnalyzer):
         
         if not CV2_AVAILABLE:
             logger.warning("OpenCV não disponível - análise avançada desabilitada")
+        
+        # Etapas por formato já restritas às bibliotecas disponíveis, para que
+        # _analyze_file não precise consultá-las a cada arquivo
+        available = _FULL_PIPELINE
+        if not PIL_AVAILABLE:
+            available &= ~_STAGE_PIL
+        if not CV2_AVAILABLE:
+            available &= ~_OPENCV_STAGES
+        self._default_stages = available
+        self._format_stages = {
+            extension: stages & available
+            for extension, stages in _FORMAT_PIPELINE.items()
+        }
     
     def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
-        """Análise específica para imagens"""
+        """
+        Análise específica para imagens
+        
+        O arquivo é lido uma única vez e decodificado uma única vez com PIL;
+        os pixels decodificados são reaproveitados pela análise com OpenCV.
+        """
         metadata = {
             'format': 'unknown',
             'dimensions': {'width': 0, 'height': 0},
@@ -58,16 +180,43 @@ class ImageAnalyzer(BaseAnalyzer):
         }
         
         try:
+            # Uma única leitura; PIL e OpenCV decodificam a partir da memória
+            data = file_path.read_bytes()
+            file_size = len(data)
+            width = height = 0
+            pixels = None
+            stages = self._format_stages.get(file_path.suffix.lower(), self._default_stages)
+            use_opencv = bool(stages & _OPENCV_STAGES)
+            
             # Análise básica com PIL
-            if PIL_AVAILABLE:
-                metadata.update(self._analyze_with_pil(file_path))
+            if stages & _STAGE_PIL:
+                try:
+                    with Image.open(io.BytesIO(data)) as img:
+                        # Dimensões originais, antes de um eventual draft
+                        width, height = img.size
+                        
+                        if use_opencv:
+                            pixels = self._pil_to_opencv(img)
+                        
+                        metadata.update(self._analyze_with_pil(img, pixels))
+                            
+                except Exception as e:
+                    logger.error(f"Erro na análise PIL para {file_path}: {e}")
+                    metadata['pil_error'] = str(e)
             
             # Análise avançada com OpenCV
-            if CV2_AVAILABLE:
-                metadata.update(self._analyze_with_opencv(file_path))
+            if use_opencv:
+                if pixels is None:
+                    # PIL indisponível ou incapaz de decodificar o formato
+                    pixels = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_UNCHANGED)
+                    if pixels is not None and not width:
+                        height, width = pixels.shape[:2]
+                
+                metadata.update(self._analyze_with_opencv(pixels, stages))
             
             # Análise de qualidade
-            metadata['quality_metrics'] = self._analyze_quality(file_path)
+            if stages & _STAGE_QUALITY:
+                metadata['quality_metrics'] = self._analyze_quality(width, height, file_size)
             
         except Exception as e:
             logger.error(f"Erro na análise de imagem {file_path}: {e}")
@@ -75,51 +224,103 @@ class ImageAnalyzer(BaseAnalyzer):
         
         return metadata
     
-    def _analyze_with_pil(self, file_path: Path) -> Dict[str, Any]:
-        """Análise usando PIL/Pillow"""
+    def _analyze_with_pil(self, img: 'Image.Image', pixels=None) -> Dict[str, Any]:
+        """
+        Análise usando PIL/Pillow sobre a imagem já aberta
+        
+        Args:
+            img: Imagem PIL
+            pixels: Pixels já decodificados por _pil_to_opencv, se houver;
+                sem eles a análise de cores decodifica JPEGs em resolução
+                reduzida (img.draft)
+        """
         metadata = {}
         
-        try:
-            with Image.open(file_path) as img:
-                # Informações básicas
-                metadata['format'] = img.format or 'unknown'
-                metadata['dimensions'] = {
-                    'width': img.size[0],
-                    'height': img.size[1]
-                }
-                metadata['color_mode'] = img.mode
-                metadata['has_transparency'] = 'transparency' in img.info
-                
-                # Informações adicionais
-                if hasattr(img, 'info') and img.info:
-                    metadata['image_info'] = self._clean_image_info(img.info)
-                
-                # Análise EXIF
-                exif_data = self._extract_exif_data(img)
-                if exif_data:
-                    metadata['has_exif'] = True
-                    metadata['exif_data'] = exif_data['exif']
-                    metadata['gps_data'] = exif_data['gps']
-                    metadata['camera_info'] = exif_data['camera']
-                    metadata['technical_info'] = exif_data['technical']
-                
-                # Análise de cores
-                metadata['color_analysis'] = self._analyze_colors(img)
-                
-        except Exception as e:
-            logger.error(f"Erro na análise PIL para {file_path}: {e}")
-            metadata['pil_error'] = str(e)
+        # Informações básicas
+        metadata['format'] = img.format or 'unknown'
+        metadata['dimensions'] = {
+            'width': img.size[0],
+            'height': img.size[1]
+        }
+        metadata['color_mode'] = img.mode
+        metadata['has_transparency'] = 'transparency' in img.info
+        
+        # Informações adicionais
+        if hasattr(img, 'info') and img.info:
+            metadata['image_info'] = self._clean_image_info(img.info)
+        
+        # Análise EXIF
+        exif_data = self._extract_exif_data(img)
+        if exif_data:
+            metadata['has_exif'] = True
+            metadata['exif_data'] = exif_data['exif']
+            metadata['gps_data'] = exif_data['gps']
+            metadata['camera_info'] = exif_data['camera']
+            metadata['technical_info'] = exif_data['technical']
+        
+        # Análise de cores; sem pixels prontos, o draft do libjpeg reduz a
+        # imagem já na IDCT
+        if pixels is None and img.format == 'JPEG':
+            img.draft(img.mode, _COLOR_DRAFT_SIZE)
+        metadata['color_analysis'] = self._analyze_colors(img, pixels)
         
         return metadata
     
-    def _analyze_with_opencv(self, file_path: Path) -> Dict[str, Any]:
-        """Análise usando OpenCV"""
+    def _pil_to_opencv(self, img: 'Image.Image'):
+        """
+        Converte a imagem PIL para o layout usado pelo OpenCV
+        
+        O resultado equivale ao de cv2.imread(..., IMREAD_UNCHANGED): canais em
+        ordem BGR(A) ou um único canal para imagens em escala de cinza. Quando
+        a decodificação do PIL não reproduz a do OpenCV (CMYK, 16 bits por
+        canal em cor, inteiros de 32 bits, ponto flutuante) retorna None, e o
+        chamador decodifica os bytes originais com cv2.imdecode.
+        
+        Returns:
+            Array de pixels, ou None se o OpenCV deve decodificar o arquivo
+        """
+        mode = img.mode
+        if mode == '1':
+            # 1 bit: o OpenCV entrega um canal com valores 0/255
+            img = img.convert('L')
+            mode = 'L'
+        elif mode in _OPENCV_EXPANDED_MODES:
+            has_alpha = mode != 'P' or 'transparency' in img.info
+            img = img.convert('RGBA' if has_alpha else 'RGB')
+            mode = img.mode
+        elif mode not in _OPENCV_NATIVE_MODES or self._has_wide_samples(img):
+            return None
+        
+        pixels = np.asarray(img)
+        if mode == 'RGB':
+            return cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR)
+        if mode == 'RGBA':
+            return cv2.cvtColor(pixels, cv2.COLOR_RGBA2BGRA)
+        return pixels
+    
+    @staticmethod
+    def _has_wide_samples(img: 'Image.Image') -> bool:
+        """Indica se o arquivo guarda mais de 8 bits por canal de cor (ex.: PNG RGB de 16 bits)"""
+        if img.mode == 'I;16':
+            return False
+        for tile in img.tile[:1]:
+            args = tile[3] if len(tile) > 3 else None
+            rawmode = args[0] if isinstance(args, tuple) and args else args
+            if isinstance(rawmode, str) and ';16' in rawmode:
+                return True
+        return False
+    
+    def _analyze_with_opencv(self, img, stages: int = _OPENCV_STAGES) -> Dict[str, Any]:
+        """
+        Análise usando OpenCV sobre os pixels já decodificados
+        
+        Args:
+            img: Pixels em BGR(A) ou escala de cinza
+            stages: Bits _STAGE_* das análises a executar
+        """
         metadata = {}
         
         try:
-            # Carregar imagem
-            img = cv2.imread(str(file_path), cv2.IMREAD_UNCHANGED)
-            
             if img is not None:
                 # Informações da imagem
                 if len(img.shape) == 3:
@@ -135,24 +336,31 @@ class ImageAnalyzer(BaseAnalyzer):
                 }
                 
                 # Análise de histograma
-                metadata['histogram_analysis'] = self._analyze_histogram(img)
+                if stages & _STAGE_HISTOGRAM:
+                    metadata['histogram_analysis'] = self._analyze_histogram(img)
                 
-                # Detecção de bordas
-                metadata['edge_analysis'] = self._analyze_edges(img)
-                
-                # Análise de nitidez
-                metadata['sharpness_score'] = self._calculate_sharpness(img)
+                if stages & (_STAGE_EDGES | _STAGE_SHARPNESS):
+                    # Escala de cinza reduzida, compartilhada por bordas e nitidez
+                    gray = self._prepare_gray(img)
+                    
+                    # Detecção de bordas
+                    if stages & _STAGE_EDGES:
+                        metadata['edge_analysis'] = self._analyze_edges(gray)
+                    
+                    # Análise de nitidez
+                    if stages & _STAGE_SHARPNESS:
+                        metadata['sharpness_score'] = self._calculate_sharpness(gray)
                 
         except Exception as e:
-            logger.error(f"Erro na análise OpenCV para {file_path}: {e}")
+            logger.error(f"Erro na análise OpenCV: {e}")
             metadata['opencv_error'] = str(e)
         
         return metadata
     
-    def _extract_exif_data(self, img: Image.Image) -> Optional[Dict[str, Any]]:
+    def _extract_exif_data(self, img: 'Image.Image') -> Optional[Dict[str, Any]]:
         """Extrai dados EXIF da imagem"""
         try:
-            exif_dict = img._getexif()
+            exif_dict = self._read_exif_tags(img)
             if not exif_dict:
                 return None
             
@@ -163,28 +371,20 @@ class ImageAnalyzer(BaseAnalyzer):
                 'technical': {}
             }
             
+            get_tag_name = TAGS.get
+            get_bucket = _EXIF_TAG_BUCKETS.get
+            process_value = self._process_exif_value
+            
+            # _process_exif_value e _process_gps_data já tratam os próprios
+            # erros, então o laço dispensa um try/except por tag
             for tag_id, value in exif_dict.items():
-                tag_name = TAGS.get(tag_id, tag_id)
+                tag_name = get_tag_name(tag_id, tag_id)
                 
-                try:
-                    # Processar valor
-                    processed_value = self._process_exif_value(value)
-                    
-                    # Categorizar dados
-                    if tag_name == 'GPSInfo':
-                        result['gps'] = self._process_gps_data(value)
-                    elif tag_name in ['Make', 'Model', 'Software']:
-                        result['camera'][tag_name] = processed_value
-                    elif tag_name in ['DateTime', 'DateTimeOriginal', 'DateTimeDigitized']:
-                        result['technical'][tag_name] = processed_value
-                    elif tag_name in ['ExposureTime', 'FNumber', 'ISO', 'FocalLength']:
-                        result['technical'][tag_name] = processed_value
-                    else:
-                        result['exif'][tag_name] = processed_value
-                        
-                except Exception as e:
-                    logger.debug(f"Erro ao processar tag EXIF {tag_name}: {e}")
-                    result['exif'][tag_name] = str(value)
+                # Categorizar dados
+                if tag_name == 'GPSInfo':
+                    result['gps'] = self._process_gps_data(value)
+                else:
+                    result[get_bucket(tag_name, 'exif')][tag_name] = process_value(value)
             
             return result
             
@@ -192,14 +392,50 @@ class ImageAnalyzer(BaseAnalyzer):
             logger.debug(f"Erro na extração EXIF: {e}")
             return None
     
+    def _read_exif_tags(self, img: 'Image.Image') -> Dict[int, Any]:
+        """
+        Lê as tags EXIF (IFD0, sub-IFD Exif e GPS) já carregadas pelo PIL
+        
+        Usa a API pública img.getexif(), que trabalha sobre o segmento APP1
+        lido na abertura do arquivo sem decodificar pixels e que também cobre
+        PNG, TIFF e WebP. Os sub-IFDs são carregados sob demanda e ficam em
+        cache no objeto Exif.
+        
+        Args:
+            img: Imagem PIL já aberta
+            
+        Em TIFF o IFD0 devolvido por getexif() é o diretório de tags da
+        própria imagem (StripOffsets, ImageWidth, BitsPerSample...); nesse
+        formato só as tags descritivas do IFD0 são mantidas.
+        
+        Returns:
+            Dicionário tag -> valor no mesmo formato de img._getexif()
+        """
+        exif = img.getexif()
+        if not exif:
+            return {}
+        
+        if img.format == 'TIFF':
+            tags = {tag: value for tag, value in exif.items() if tag in _TIFF_DESCRIPTIVE_TAGS}
+        else:
+            tags = dict(exif)
+        if _EXIF_IFD_POINTER in exif:
+            tags.update(exif.get_ifd(_EXIF_IFD_POINTER))
+        if _GPS_IFD_POINTER in exif:
+            tags[_GPS_IFD_POINTER] = exif.get_ifd(_GPS_IFD_POINTER)
+        
+        return tags
+    
     def _process_gps_data(self, gps_info: Dict) -> Dict[str, Any]:
         """Processa dados GPS do EXIF"""
         gps_data = {}
         
         try:
+            get_tag_name = GPSTAGS.get
+            process_value = self._process_exif_value
+            
             for key, value in gps_info.items():
-                tag_name = GPSTAGS.get(key, key)
-                gps_data[tag_name] = self._process_exif_value(value)
+                gps_data[get_tag_name(key, key)] = process_value(value)
             
             # Converter coordenadas se disponíveis
             if 'GPSLatitude' in gps_data and 'GPSLongitude' in gps_data:
@@ -229,16 +465,10 @@ class ImageAnalyzer(BaseAnalyzer):
             if not coord_tuple or len(coord_tuple) != 3:
                 return None
             
-            degrees = float(coord_tuple[0])
-            minutes = float(coord_tuple[1])
-            seconds = float(coord_tuple[2])
-            
-            decimal = degrees + (minutes / 60.0) + (seconds / 3600.0)
+            degrees, minutes, seconds = map(float, coord_tuple)
+            decimal = degrees + minutes / 60.0 + seconds / 3600.0
             
-            if ref in ['S', 'W']:
-                decimal = -decimal
-            
-            return decimal
+            return -decimal if ref in _GPS_NEGATIVE_REFS else decimal
             
         except Exception as e:
             logger.debug(f"Erro na conversão GPS: {e}")
@@ -247,17 +477,35 @@ class ImageAnalyzer(BaseAnalyzer):
     def _process_exif_value(self, value: Any) -> Any:
         """Processa valor EXIF para serialização"""
         try:
-            if isinstance(value, (str, int, float, bool)):
-                return value
-            elif isinstance(value, bytes):
-                try:
-                    return value.decode('utf-8', errors='ignore')
-                except:
-                    return f"<bytes:{len(value)}>"
-            elif isinstance(value, (tuple, list)):
-                return [self._process_exif_value(v) for v in value]
-            else:
-                return str(value)
+            # Caso comum: tipo exato presente na tabela de conversão
+            convert = _EXIF_CONVERTERS.get(type(value))
+            if convert is not None:
+                return convert(value)
+            
+            if not isinstance(value, (tuple, list)):
+                return _convert_exif_scalar(value)
+            
+            # Sequências (ex: racionais GPS aninhados) percorridas com uma pilha
+            # explícita em vez de recursão
+            result = []
+            stack = [(iter(value), result)]
+            while stack:
+                items, out = stack[-1]
+                for item in items:
+                    convert = _EXIF_CONVERTERS.get(type(item))
+                    if convert is not None:
+                        out.append(convert(item))
+                    elif isinstance(item, (tuple, list)):
+                        child = []
+                        out.append(child)
+                        stack.append((iter(item), child))
+                        break
+                    else:
+                        out.append(_convert_exif_scalar(item))
+                else:
+                    stack.pop()
+            
+            return result
         except:
             return str(value)
     
@@ -274,8 +522,15 @@ class ImageAnalyzer(BaseAnalyzer):
                 cleaned[key] = f"<{type(value).__name__}>"
         return cleaned
     
-    def _analyze_colors(self, img: Image.Image) -> Dict[str, Any]:
-        """Análise de cores da imagem"""
+    def _analyze_colors(self, img: 'Image.Image', pixels=None) -> Dict[str, Any]:
+        """
+        Análise de cores da imagem
+        
+        Args:
+            img: Imagem PIL
+            pixels: Pixels BGR(A) já decodificados por _pil_to_opencv; quando
+                presentes, a redução é feita com cv2.resize sobre eles
+        """
         color_info = {}
         
         try:
@@ -286,12 +541,21 @@ class ImageAnalyzer(BaseAnalyzer):
             # Análise de cores dominantes (simplificada)
             if img.mode in ['RGB', 'RGBA']:
                 # Reduzir imagem para análise mais rápida
-                small_img = img.resize((50, 50))
-                colors = small_img.getcolors(maxcolors=256*256*256)
+                if pixels is not None:
+                    small = cv2.resize(pixels, (50, 50), interpolation=cv2.INTER_AREA)
+                    small = cv2.cvtColor(
+                        small, cv2.COLOR_BGR2RGB if small.shape[2] == 3 else cv2.COLOR_BGRA2RGBA
+                    )
+                    colors = self._count_colors_numpy(small, top=5)
+                elif NUMPY_AVAILABLE:
+                    colors = self._count_colors_numpy(img.resize((50, 50)), top=5)
+                else:
+                    small_img = img.resize((50, 50))
+                    colors = small_img.getcolors(maxcolors=256*256*256) or []
+                    colors.sort(key=lambda x: x[0], reverse=True)
                 
                 if colors:
                     # Cores mais frequentes
-                    colors.sort(key=lambda x: x[0], reverse=True)
                     dominant_colors = []
                     
                     for count, color in colors[:5]:  # Top 5
@@ -310,63 +574,110 @@ class ImageAnalyzer(BaseAnalyzer):
         
         return color_info
     
+    def _count_colors_numpy(self, img, top: int) -> List[Tuple[int, Tuple[int, ...]]]:
+        """
+        Cores mais frequentes de uma imagem RGB/RGBA, no formato de getcolors()
+        
+        Cada pixel é empacotado em um uint32 e contado com np.unique; apenas as
+        `top` cores mais frequentes são ordenadas.
+        
+        Args:
+            img: Imagem PIL em modo RGB ou RGBA, ou matriz (altura, largura,
+                canais) com os canais nessa ordem
+            top: Número de cores retornadas
+            
+        Returns:
+            Lista de (contagem, cor) em ordem decrescente de frequência
+        """
+        pixels = np.asarray(img, dtype=np.uint8)
+        channels = pixels.shape[2]
+        pixels = pixels.reshape(-1, channels).astype(np.uint32)
+        
+        packed = pixels[:, 0]
+        for channel in range(1, channels):
+            packed = (packed << 8) | pixels[:, channel]
+        
+        values, counts = np.unique(packed, return_counts=True)
+        if values.size > top:
+            candidates = np.argpartition(-counts, top)[:top]
+        else:
+            candidates = np.arange(values.size)
+        # Ordenar só os candidatos (estável: empates pela cor empacotada)
+        order = candidates[np.argsort(-counts[candidates], kind='stable')]
+        
+        shifts = range(8 * (channels - 1), -1, -8)
+        return [
+            (int(counts[i]), tuple(int(values[i] >> shift) & 0xFF for shift in shifts))
+            for i in order
+        ]
+    
     def _analyze_histogram(self, img) -> Dict[str, Any]:
         """Análise de histograma usando OpenCV"""
         if not CV2_AVAILABLE:
             return {}
         
         try:
-            import numpy as np
-            
-            hist_data = {}
-            
             if len(img.shape) == 3:
-                # Imagem colorida
-                colors = ['blue', 'green', 'red']
-                for i, color in enumerate(colors):
-                    hist = cv2.calcHist([img], [i], None, [256], [0, 256])
-                    hist_data[f'{color}_histogram'] = {
-                        'mean': float(np.mean(hist)),
-                        'std': float(np.std(hist)),
-                        'max': float(np.max(hist)),
-                        'min': float(np.min(hist))
-                    }
+                # Imagem colorida (canais em ordem BGR; alfa ignorado)
+                names = _HISTOGRAM_CHANNELS
             else:
                 # Imagem em escala de cinza
-                hist = cv2.calcHist([img], [0], None, [256], [0, 256])
-                hist_data['gray_histogram'] = {
-                    'mean': float(np.mean(hist)),
-                    'std': float(np.std(hist)),
-                    'max': float(np.max(hist)),
-                    'min': float(np.min(hist))
+                names = ('gray',)
+            
+            # cv2.calcHist é bem mais rápido que np.bincount aqui (que converte
+            # cada canal para intp); as reduções também ficam no OpenCV, em
+            # código C que libera o GIL durante lotes em threads
+            histogram_analysis = {}
+            for channel, name in enumerate(names):
+                hist = cv2.calcHist([img], [channel], None, [256], [0, 256])
+                mean, std = cv2.meanStdDev(hist)
+                min_value, max_value, _, _ = cv2.minMaxLoc(hist)
+                histogram_analysis[f'{name}_histogram'] = {
+                    'mean': float(mean[0, 0]),
+                    'std': float(std[0, 0]),
+                    'max': float(max_value),
+                    'min': float(min_value)
                 }
             
-            return hist_data
+            return histogram_analysis
             
         except Exception as e:
             logger.debug(f"Erro na análise de histograma: {e}")
             return {'histogram_error': str(e)}
     
-    def _analyze_edges(self, img) -> Dict[str, Any]:
-        """Análise de bordas usando OpenCV"""
+    def _prepare_gray(self, img):
+        """
+        Imagem em escala de cinza, reduzida para as análises estatísticas
+        
+        Bordas e nitidez são métricas estatísticas que convergem bem abaixo da
+        resolução original; imagens maiores que _ANALYSIS_MAX_DIMENSION são
+        reduzidas (INTER_AREA) antes do Canny e do Laplaciano.
+        """
+        # Converter para escala de cinza se necessário
+        if len(img.shape) == 3:
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        else:
+            gray = img
+        
+        largest = max(gray.shape[:2])
+        if largest > _ANALYSIS_MAX_DIMENSION:
+            scale = _ANALYSIS_MAX_DIMENSION / largest
+            gray = cv2.resize(gray, (0, 0), fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
+        return gray
+    
+    def _analyze_edges(self, gray) -> Dict[str, Any]:
+        """Análise de bordas usando OpenCV (sobre a imagem de _prepare_gray)"""
         if not CV2_AVAILABLE:
             return {}
         
         try:
-            import numpy as np
-            
-            # Converter para escala de cinza se necessário
-            if len(img.shape) == 3:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = img
-            
             # Detectar bordas com Canny
             edges = cv2.Canny(gray, 50, 150)
             
             # Calcular estatísticas
-            total_pixels = edges.shape[0] * edges.shape[1]
-            edge_pixels = np.count_nonzero(edges)
+            total_pixels = edges.size
+            edge_pixels = cv2.countNonZero(edges)
             edge_percentage = (edge_pixels / total_pixels) * 100
             
             return {
@@ -380,31 +691,36 @@ class ImageAnalyzer(BaseAnalyzer):
             logger.debug(f"Erro na análise de bordas: {e}")
             return {'edge_analysis_error': str(e)}
     
-    def _calculate_sharpness(self, img) -> float:
-        """Calcula score de nitidez da imagem"""
+    def _calculate_sharpness(self, gray) -> float:
+        """Calcula score de nitidez da imagem (sobre a imagem de _prepare_gray)"""
         if not CV2_AVAILABLE:
             return 0.0
         
         try:
-            import numpy as np
+            # Calcular variância do Laplaciano. Para 8 bits o resultado cabe em
+            # int16 (|4 * 255| < 2**15), 4x menos memória que float64; média e
+            # desvio saem de uma única passagem do meanStdDev
+            depth = cv2.CV_16S if gray.dtype == np.uint8 else cv2.CV_64F
+            _, std = cv2.meanStdDev(cv2.Laplacian(gray, depth))
             
-            # Converter para escala de cinza se necessário
-            if len(img.shape) == 3:
-                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = img
-            
-            # Calcular variância do Laplaciano
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
-            return float(laplacian_var)
+            return float(std[0, 0]) ** 2
             
         except Exception as e:
             logger.debug(f"Erro no cálculo de nitidez: {e}")
             return 0.0
     
-    def _analyze_quality(self, file_path: Path) -> Dict[str, Any]:
-        """Análise de qualidade da imagem"""
+    def _analyze_quality(self, width: int, height: int, file_size: int) -> Dict[str, Any]:
+        """
+        Análise de qualidade da imagem
+        
+        Args:
+            width: Largura em pixels (0 se desconhecida)
+            height: Altura em pixels (0 se desconhecida)
+            file_size: Tamanho do arquivo em bytes
+            
+        Returns:
+            Métricas de qualidade estimadas
+        """
         quality_metrics = {
             'file_size_mb': 0.0,
             'compression_ratio': 0.0,
@@ -413,31 +729,24 @@ class ImageAnalyzer(BaseAnalyzer):
         
         try:
             # Tamanho do arquivo
-            file_size = file_path.stat().st_size
             quality_metrics['file_size_mb'] = file_size / (1024 * 1024)
             
             # Estimativa de qualidade baseada em tamanho e dimensões
-            if PIL_AVAILABLE:
-                with Image.open(file_path) as img:
-                    width, height = img.size
-                    total_pixels = width * height
-                    
-                    if total_pixels > 0:
-                        bytes_per_pixel = file_size / total_pixels
-                        quality_metrics['bytes_per_pixel'] = bytes_per_pixel
-                        
-                        # Estimativa grosseira de qualidade
-                        if bytes_per_pixel > 3:
-                            quality_metrics['estimated_quality'] = 'high'
-                        elif bytes_per_pixel > 1.5:
-                            quality_metrics['estimated_quality'] = 'medium'
-                        else:
-                            quality_metrics['estimated_quality'] = 'low'
-                        
-                        # Razão de compressão estimada
-                        uncompressed_size = total_pixels * 3  # RGB
-                        if uncompressed_size > 0:
-                            quality_metrics['compression_ratio'] = file_size / uncompressed_size
+            total_pixels = width * height
+            
+            if total_pixels > 0:
+                bytes_per_pixel = file_size / total_pixels
+                quality_metrics['bytes_per_pixel'] = bytes_per_pixel
+                
+                # Estimativa grosseira de qualidade
+                quality_metrics['estimated_quality'] = _QUALITY_LABELS[
+                    bisect_left(_QUALITY_THRESHOLDS, bytes_per_pixel)
+                ]
+                
+                # Razão de compressão estimada
+                uncompressed_size = total_pixels * 3  # RGB
+                if uncompressed_size > 0:
+                    quality_metrics['compression_ratio'] = file_size / uncompressed_size
             
         except Exception as e:
             logger.debug(f"Erro na análise de qualidade: {e}")
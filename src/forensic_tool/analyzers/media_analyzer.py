@@ -2,14 +2,104 @@
 Analisador especializado para arquivos multimídia (áudio e vídeo)
 """
 
+import math
+import os
+import struct
+from bisect import bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from fractions import Fraction
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple
 import logging
-from datetime import datetime, timedelta
-from .base import MultiFormatAnalyzer
+from datetime import datetime
+from .base import AnalysisResult, MultiFormatAnalyzer
 
 logger = logging.getLogger(__name__)
 
+# Faixas de qualidade: limites inferiores (inclusivos, para bisect_right) e,
+# para cada faixa, rótulo e pontuação
+_BITRATE_THRESHOLDS = (128, 192, 256, 320)
+_BITRATE_LABELS = (
+    'Low (<128 kbps)', 'Standard (128+ kbps)', 'Good (192+ kbps)',
+    'High (256+ kbps)', 'Very High (320+ kbps)'
+)
+_BITRATE_SCORES = (0, 1, 2, 3, 4)
+
+_SAMPLE_RATE_THRESHOLDS = (44100, 48000, 96000)
+_SAMPLE_RATE_LABELS = (
+    'Low (<44.1 kHz)', 'CD Quality (44.1 kHz)', 'High (48+ kHz)', 'Very High (96+ kHz)'
+)
+_SAMPLE_RATE_SCORES = (0, 1, 1, 2)
+
+_AUDIO_QUALITY_THRESHOLDS = (1, 3, 5)
+_AUDIO_QUALITY_LABELS = ('Poor', 'Fair', 'Good', 'Excellent')
+
+_RESOLUTION_THRESHOLDS = (854 * 480, 1280 * 720, 1920 * 1080, 3840 * 2160)
+_RESOLUTION_LABELS = ('Low', 'SD', 'HD', 'Full HD', '4K')
+_RESOLUTION_SCORES = (2, 4, 6, 8, 10)
+
+_FPS_THRESHOLDS = (24, 30, 60)
+_FPS_LABELS = ('Low (<24 fps)', 'Cinema (24+ fps)', 'Standard (30+ fps)', 'High (60+ fps)')
+_FPS_SCORES = (-1, 0, 1, 2)
+
+# Extensões atendidas por cada handler
+_MP3_EXTENSIONS = frozenset({'.mp3'})
+_FLAC_EXTENSIONS = frozenset({'.flac'})
+_MP4_AUDIO_EXTENSIONS = frozenset({'.m4a', '.aac'})
+_OGG_EXTENSIONS = frozenset({'.ogg'})
+_WAV_EXTENSIONS = frozenset({'.wav'})
+_WMA_EXTENSIONS = frozenset({'.wma'})
+_VIDEO_EXTENSIONS = frozenset({
+    '.mp4', '.avi', '.mkv', '.mov', '.wmv',
+    '.flv', '.webm', '.m4v', '.3gp'
+})
+
+# Mapeamento de tags ID3 comuns
+_ID3_TAG_NAMES = {
+    'TIT2': 'title',
+    'TPE1': 'artist',
+    'TALB': 'album',
+    'TDRC': 'year',
+    'TCON': 'genre',
+    'TPE2': 'album_artist',
+    'TRCK': 'track_number',
+    'TPOS': 'disc_number',
+    'COMM::eng': 'comment'
+}
+
+# Mapeamento de atoms MP4
+_MP4_ATOM_NAMES = {
+    '©nam': 'title',
+    '©ART': 'artist',
+    '©alb': 'album',
+    '©day': 'year',
+    '©gen': 'genre',
+    'trkn': 'track_number',
+    'disk': 'disc_number',
+    '©cmt': 'comment'
+}
+
+# Maior distância (em frames) percorrida com grab() antes de preferir um seek.
+# Um seek decodifica a partir do keyframe anterior: em codecs de GOP longo
+# (H.264/HEVC/VP9/AV1, keyframes a cada ~250 frames) isso custa centenas de
+# frames, mas em codecs intra ou de GOP curto o seek sai mais barato que
+# decodificar mais de ~16 frames com grab()
+_LONG_GOP_CODECS = frozenset({
+    'avc1', 'avc3', 'h264', 'x264', 'hev1', 'hvc1', 'hevc', 'h265',
+    'vp80', 'vp90', 'vp09', 'av01'
+})
+_LONG_GOP_MAX_GRAB_GAP = 250
+_SHORT_GOP_MAX_GRAB_GAP = 16
+
+# Vídeos até esta duração (em segundos) não passam pela análise de frames
+_MIN_FRAME_ANALYSIS_SECONDS = 0.5
+
+# A partir de 4K (3840x2160) menos frames são amostrados
+_UHD_PIXELS = _RESOLUTION_THRESHOLDS[-1]
+
+# Miniatura (largura, altura) usada na detecção de mudanças de cena
+_SCENE_THUMBNAIL_SIZE = (128, 72)
+
 # Importações condicionais
 try:
     import mutagen
@@ -18,6 +108,8 @@ try:
     from mutagen.flac import FLAC
     from mutagen.mp4 import MP4
     from mutagen.oggvorbis import OggVorbis
+    from mutagen.wave import WAVE
+    from mutagen.asf import ASF
     MUTAGEN_AVAILABLE = True
 except ImportError:
     MUTAGEN_AVAILABLE = False
@@ -28,12 +120,48 @@ try:
 except ImportError:
     CV2_AVAILABLE = False
 
+if CV2_AVAILABLE:
+    # Propriedades lidas de cada vídeo, resolvidas uma única vez na importação
+    # (na ordem desempacotada por _read_video_properties)
+    _VIDEO_PROPERTY_IDS = (
+        cv2.CAP_PROP_FPS,
+        cv2.CAP_PROP_FRAME_COUNT,
+        cv2.CAP_PROP_FRAME_WIDTH,
+        cv2.CAP_PROP_FRAME_HEIGHT,
+        cv2.CAP_PROP_FOURCC,
+        cv2.CAP_PROP_BUFFERSIZE,
+    )
+
 try:
     import numpy as np
     NUMPY_AVAILABLE = True
 except ImportError:
     NUMPY_AVAILABLE = False
 
+try:
+    import av
+    PYAV_AVAILABLE = True
+except ImportError:
+    PYAV_AVAILABLE = False
+
+
+_NO_TEXT = object()
+
+
+def _id3_frame_text(value: Any) -> str:
+    """Primeiro texto de um frame ID3 (ou o próprio valor como texto)"""
+    text = getattr(value, 'text', _NO_TEXT)
+    if text is _NO_TEXT:
+        return str(value)
+    return str(text[0]) if text else ''
+
+
+def _first_tag_value(value: Any) -> str:
+    """Primeiro item de uma tag multivalorada, como texto"""
+    if isinstance(value, list):
+        return str(value[0]) if value else ''
+    return str(value)
+
 
 class MediaAnalyzer(MultiFormatAnalyzer):
     """Analisador para arquivos multimídia"""
@@ -44,18 +172,16 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         # Registrar handlers para diferentes formatos
         if MUTAGEN_AVAILABLE:
             # Áudio
-            self.add_format_handler({'.mp3'}, self._analyze_mp3)
-            self.add_format_handler({'.flac'}, self._analyze_flac)
-            self.add_format_handler({'.m4a', '.aac'}, self._analyze_mp4_audio)
-            self.add_format_handler({'.ogg'}, self._analyze_ogg)
-            self.add_format_handler({'.wav', '.wma'}, self._analyze_generic_audio)
+            self.add_format_handler(_MP3_EXTENSIONS, self._analyze_mp3)
+            self.add_format_handler(_FLAC_EXTENSIONS, self._analyze_flac)
+            self.add_format_handler(_MP4_AUDIO_EXTENSIONS, self._analyze_mp4_audio)
+            self.add_format_handler(_OGG_EXTENSIONS, self._analyze_ogg)
+            self.add_format_handler(_WAV_EXTENSIONS, self._analyze_wav)
+            self.add_format_handler(_WMA_EXTENSIONS, self._analyze_wma)
         
         if CV2_AVAILABLE:
             # Vídeo
-            self.add_format_handler({
-                '.mp4', '.avi', '.mkv', '.mov', '.wmv', 
-                '.flv', '.webm', '.m4v', '.3gp'
-            }, self._analyze_video)
+            self.add_format_handler(_VIDEO_EXTENSIONS, self._analyze_video)
         
         # Log de disponibilidade
         if not MUTAGEN_AVAILABLE:
@@ -63,6 +189,79 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         if not CV2_AVAILABLE:
             logger.warning("OpenCV não disponível - análise de vídeo desabilitada")
     
+    def _prepare_worker(self) -> None:
+        """Um vídeo por processo: threads internas do OpenCV só disputariam os mesmos núcleos"""
+        if CV2_AVAILABLE:
+            cv2.setNumThreads(1)
+    
+    def analyze_many(self, file_paths: Iterable[Path],
+                     max_workers: Optional[int] = None) -> Iterator[AnalysisResult]:
+        """
+        Analisa vários arquivos de mídia, com os vídeos em processos separados
+        
+        A decodificação e a amostragem de frames dominam o custo dos vídeos e
+        escalam com processos; o áudio (só leitura de tags e cabeçalhos) é
+        analisado no processo atual, em um pool de threads, para que as
+        pequenas leituras aleatórias de vários arquivos se sobreponham enquanto
+        os vídeos são processados. Os dois pools recebem o trabalho já na
+        chamada. Com menos de dois vídeos usa apenas o pool de threads da
+        classe base.
+        
+        Args:
+            file_paths: Caminhos dos arquivos
+            max_workers: Número máximo de processos e de threads (padrão: número de CPUs)
+            
+        Returns:
+            Iterador de resultados na mesma ordem dos caminhos recebidos
+        """
+        paths = list(file_paths)
+        video_indexes = [
+            index for index, path in enumerate(paths)
+            if self.format_handlers.get(path.suffix.lower()) == self._analyze_video
+        ]
+        if len(video_indexes) < 2:
+            return super().analyze_many(paths, max_workers)
+        
+        videos = self._analyze_many_in_processes(
+            [paths[index] for index in video_indexes], max_workers
+        )
+        
+        video_index_set = set(video_indexes)
+        audio_executor = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                                            thread_name_prefix=f"{self.name}-batch")
+        others = {
+            index: audio_executor.submit(self.analyze, path)
+            for index, path in enumerate(paths) if index not in video_index_set
+        }
+        return self._merge_media_results(len(paths), videos, others, audio_executor)
+    
+    @staticmethod
+    def _merge_media_results(count: int, videos: Iterator[AnalysisResult],
+                             others: Dict[int, Future],
+                             audio_executor: ThreadPoolExecutor) -> Iterator[AnalysisResult]:
+        """
+        Intercala os resultados dos vídeos e dos demais arquivos pela posição
+        
+        Args:
+            count: Número total de arquivos
+            videos: Resultados dos vídeos, na ordem em que aparecem
+            others: Futures dos demais arquivos, por índice na lista original
+            audio_executor: Pool de threads dos demais arquivos (encerrado no final)
+            
+        Yields:
+            Resultados na ordem dos caminhos originais
+        """
+        with audio_executor:
+            try:
+                for index in range(count):
+                    future = others.get(index)
+                    yield future.result() if future is not None else next(videos)
+            finally:
+                # Cancela o que ainda não começou se o consumidor parar antes
+                for future in others.values():
+                    future.cancel()
+                videos.close()
+    
     def _analyze_mp3(self, file_path: Path) -> Dict[str, Any]:
         """Análise específica para arquivos MP3"""
         metadata = {
@@ -232,8 +431,23 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         
         return metadata
     
-    def _analyze_generic_audio(self, file_path: Path) -> Dict[str, Any]:
-        """Análise genérica para outros formatos de áudio"""
+    def _analyze_wav(self, file_path: Path) -> Dict[str, Any]:
+        """Análise para arquivos WAV (parser direto, sem sondagem)"""
+        return self._analyze_generic_audio(file_path, WAVE)
+    
+    def _analyze_wma(self, file_path: Path) -> Dict[str, Any]:
+        """Análise para arquivos WMA/ASF (parser direto, sem sondagem)"""
+        return self._analyze_generic_audio(file_path, ASF)
+    
+    def _analyze_generic_audio(self, file_path: Path, audio_class=None) -> Dict[str, Any]:
+        """
+        Análise genérica para outros formatos de áudio
+        
+        Args:
+            file_path: Caminho do arquivo
+            audio_class: Classe do mutagen para o formato; sem ela o formato é
+                detectado por mutagen.File, que testa cada parser
+        """
         metadata = {
             'media_type': 'Generic Audio',
             'audio_info': {},
@@ -243,9 +457,12 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            audio_file = mutagen.File(file_path)
+            if audio_class is not None:
+                audio_file = audio_class(file_path)
+            else:
+                audio_file = mutagen.File(file_path)
             
-            if audio_file:
+            if audio_file is not None:
                 # Informações básicas
                 if audio_file.info:
                     info = audio_file.info
@@ -282,25 +499,42 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            cap = cv2.VideoCapture(str(file_path))
+            # Backend FFmpeg explícito evita a sondagem da lista de backends
+            cap = cv2.VideoCapture(str(file_path), cv2.CAP_FFMPEG)
+            if not cap.isOpened():
+                cap = cv2.VideoCapture(str(file_path))
             
             if not cap.isOpened():
                 metadata['analysis_error'] = "Não foi possível abrir o arquivo de vídeo"
                 return metadata
             
-            # Informações básicas do vídeo
-            metadata['video_info'] = self._extract_video_info(cap)
-            
-            # Análise de qualidade
-            metadata['quality_analysis'] = self._analyze_video_quality(cap)
-            
-            # Análise de frames (limitada)
-            metadata['frame_analysis'] = self._analyze_video_frames(cap, max_frames=10)
-            
-            # Informações técnicas adicionais
-            metadata['technical_info'] = self._analyze_video_technical(cap)
-            
-            cap.release()
+            try:
+                # Propriedades lidas uma única vez e compartilhadas pelas análises
+                props = self._read_video_properties(cap)
+                
+                # Informações básicas do vídeo
+                metadata['video_info'] = self._extract_video_info(props)
+                
+                # Análise de qualidade
+                metadata['quality_analysis'] = self._analyze_video_quality(props)
+                
+                # Análise de frames (limitada); vídeos curtos demais não rendem
+                # estatísticas úteis e em 4K bastam menos frames
+                fps = props['fps']
+                duration = props['frame_count'] / fps if fps > 0 else 0
+                pos_msec = 0.0
+                if props['frame_count'] < 2 or duration <= _MIN_FRAME_ANALYSIS_SECONDS:
+                    metadata['frame_analysis'] = {'frames_analyzed': 0, 'skipped_reason': 'too_short'}
+                else:
+                    max_frames = 4 if props['width'] * props['height'] >= _UHD_PIXELS else 10
+                    metadata['frame_analysis'], pos_msec = self._analyze_video_frames(
+                        cap, props, max_frames=max_frames, file_path=file_path
+                    )
+                
+                # Informações técnicas adicionais
+                metadata['technical_info'] = self._analyze_video_technical(cap, props, pos_msec)
+            finally:
+                cap.release()
             
         except Exception as e:
             logger.error(f"Erro na análise de vídeo {file_path}: {e}")
@@ -308,13 +542,33 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         
         return metadata
     
-    def _extract_video_info(self, cap) -> Dict[str, Any]:
+    def _read_video_properties(self, cap) -> Dict[str, Any]:
+        """
+        Lê de uma vez as propriedades do vídeo usadas pelas análises
+        
+        Args:
+            cap: cv2.VideoCapture aberto
+            
+        Returns:
+            Dicionário com fps, frame_count, width, height, codec e buffer_size
+        """
+        fps, frame_count, width, height, fourcc, buffer_size = map(cap.get, _VIDEO_PROPERTY_IDS)
+        return {
+            'fps': fps,
+            'frame_count': int(frame_count),
+            'width': int(width),
+            'height': int(height),
+            'codec': self._fourcc_to_str(fourcc),
+            'buffer_size': int(buffer_size)
+        }
+    
+    def _extract_video_info(self, props: Dict[str, Any]) -> Dict[str, Any]:
         """Extrai informações básicas do vídeo"""
         try:
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            fps = props['fps']
+            frame_count = props['frame_count']
+            width = props['width']
+            height = props['height']
             
             duration = frame_count / fps if fps > 0 else 0
             
@@ -327,14 +581,14 @@ class MediaAnalyzer(MultiFormatAnalyzer):
                 'duration_seconds': round(duration, 2),
                 'duration_formatted': self._format_duration(duration),
                 'aspect_ratio': round(width / height, 2) if height > 0 else 0,
-                'codec': self._get_video_codec(cap)
+                'codec': props['codec']
             }
             
         except Exception as e:
             logger.debug(f"Erro ao extrair informações de vídeo: {e}")
             return {'extraction_error': str(e)}
     
-    def _analyze_video_quality(self, cap) -> Dict[str, Any]:
+    def _analyze_video_quality(self, props: Dict[str, Any]) -> Dict[str, Any]:
         """Análise de qualidade do vídeo"""
         quality_info = {
             'resolution_category': 'unknown',
@@ -344,42 +598,21 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         }
         
         try:
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
+            width = props['width']
+            height = props['height']
+            fps = props['fps']
             
             # Categorizar resolução
-            total_pixels = width * height
-            if total_pixels >= 3840 * 2160:  # 4K
-                quality_info['resolution_category'] = '4K'
-                quality_score = 10
-            elif total_pixels >= 1920 * 1080:  # Full HD
-                quality_info['resolution_category'] = 'Full HD'
-                quality_score = 8
-            elif total_pixels >= 1280 * 720:  # HD
-                quality_info['resolution_category'] = 'HD'
-                quality_score = 6
-            elif total_pixels >= 854 * 480:  # SD
-                quality_info['resolution_category'] = 'SD'
-                quality_score = 4
-            else:
-                quality_info['resolution_category'] = 'Low'
-                quality_score = 2
+            band = bisect_right(_RESOLUTION_THRESHOLDS, width * height)
+            quality_info['resolution_category'] = _RESOLUTION_LABELS[band]
+            quality_score = _RESOLUTION_SCORES[band]
             
             # Categorizar FPS
-            if fps >= 60:
-                quality_info['fps_category'] = 'High (60+ fps)'
-                quality_score += 2
-            elif fps >= 30:
-                quality_info['fps_category'] = 'Standard (30+ fps)'
-                quality_score += 1
-            elif fps >= 24:
-                quality_info['fps_category'] = 'Cinema (24+ fps)'
-            else:
-                quality_info['fps_category'] = 'Low (<24 fps)'
-                quality_score -= 1
+            band = bisect_right(_FPS_THRESHOLDS, fps)
+            quality_info['fps_category'] = _FPS_LABELS[band]
+            quality_score += _FPS_SCORES[band]
             
-            quality_info['quality_score'] = max(0, min(10, quality_score))
+            quality_info['quality_score'] = quality_score if 0 <= quality_score <= 10 else max(0, min(10, quality_score))
             
         except Exception as e:
             logger.debug(f"Erro na análise de qualidade de vídeo: {e}")
@@ -387,10 +620,20 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         
         return quality_info
     
-    def _analyze_video_frames(self, cap, max_frames: int = 10) -> Dict[str, Any]:
-        """Análise de frames do vídeo"""
+    def _analyze_video_frames(self, cap, props: Dict[str, Any], max_frames: int = 10,
+                              file_path: Optional[Path] = None) -> Tuple[Dict[str, Any], float]:
+        """
+        Análise de frames do vídeo
+        
+        Com PyAV disponível (e file_path informado) os frames amostrados são
+        lidos por seeks até o keyframe anterior seguidos de decodificação;
+        caso contrário, pelo próprio VideoCapture.
+        
+        Returns:
+            Tupla (análise dos frames, posição em ms do último frame lido)
+        """
         if not NUMPY_AVAILABLE:
-            return {'frame_analysis_error': 'NumPy não disponível'}
+            return {'frame_analysis_error': 'NumPy não disponível'}, 0.0
         
         frame_analysis = {
             'frames_analyzed': 0,
@@ -400,58 +643,160 @@ class MediaAnalyzer(MultiFormatAnalyzer):
             'scene_changes': 0
         }
         
+        container = None
+        pos_msec = 0.0
         try:
-            frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            frame_count = props['frame_count']
             if frame_count == 0:
-                return frame_analysis
+                return frame_analysis, pos_msec
             
             # Selecionar frames para análise
-            frame_indices = np.linspace(0, frame_count - 1, min(max_frames, frame_count), dtype=int)
+            frame_indices = np.linspace(
+                0, frame_count - 1, min(max_frames, frame_count)
+            ).astype(np.int64, copy=False).tolist()
+            
+            if props['codec'].lower() in _LONG_GOP_CODECS:
+                max_grab_gap = _LONG_GOP_MAX_GRAB_GAP
+            else:
+                max_grab_gap = _SHORT_GOP_MAX_GRAB_GAP
+            
+            if PYAV_AVAILABLE and file_path is not None:
+                try:
+                    container = av.open(str(file_path))
+                except Exception as e:
+                    logger.debug(f"PyAV não abriu {file_path}, usando OpenCV: {e}")
+            
+            if container is not None and container.streams.video:
+                frames = self._iter_sampled_frames_pyav(container, props, frame_indices, max_grab_gap)
+            else:
+                frames = self._iter_sampled_frames_opencv(cap, frame_indices, max_grab_gap)
             
-            brightness_values = []
+            brightness_values = np.empty(len(frame_indices), dtype=np.float64)
+            analyzed = 0
             previous_frame = None
             scene_changes = 0
             
-            for frame_idx in frame_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
-                ret, frame = cap.read()
-                
-                if not ret:
-                    continue
-                
+            for pos_msec, frame in frames:
                 # Converter para escala de cinza
                 gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
                 
                 # Calcular brilho médio
-                brightness = np.mean(gray)
-                brightness_values.append(brightness)
+                brightness_values[analyzed] = cv2.mean(gray)[0]
+                
+                # Mudanças de cena comparadas em uma miniatura: a proporção de
+                # pixels alterados não depende da resolução original
+                small = cv2.resize(gray, _SCENE_THUMBNAIL_SIZE, interpolation=cv2.INTER_AREA)
                 
                 # Detectar mudanças de cena (simplificado)
                 if previous_frame is not None:
-                    diff = cv2.absdiff(previous_frame, gray)
-                    change_percentage = (np.count_nonzero(diff > 30) / diff.size) * 100
+                    diff = cv2.absdiff(previous_frame, small)
+                    changed = cv2.countNonZero(cv2.inRange(diff, 31, 255))
+                    change_percentage = changed * (100.0 / diff.size)
                     
                     if change_percentage > 20:  # Threshold arbitrário
                         scene_changes += 1
                 
-                previous_frame = gray.copy()
-                frame_analysis['frames_analyzed'] += 1
+                previous_frame = small
+                analyzed += 1
+            
+            frame_analysis['frames_analyzed'] = analyzed
             
             # Calcular estatísticas
-            if brightness_values:
-                frame_analysis['average_brightness'] = float(np.mean(brightness_values))
-                frame_analysis['brightness_variance'] = float(np.var(brightness_values))
+            if analyzed:
+                brightness_values = brightness_values[:analyzed]
+                frame_analysis['average_brightness'] = float(brightness_values.mean())
+                frame_analysis['brightness_variance'] = float(brightness_values.var())
                 frame_analysis['scene_changes'] = scene_changes
                 frame_analysis['motion_detected'] = scene_changes > 0
             
         except Exception as e:
             logger.debug(f"Erro na análise de frames: {e}")
             frame_analysis['frame_analysis_error'] = str(e)
+        finally:
+            if container is not None:
+                container.close()
+        
+        return frame_analysis, pos_msec
+    
+    def _iter_sampled_frames_opencv(self, cap, frame_indices: List[int],
+                                    max_grab_gap: int) -> Iterator[Any]:
+        """
+        Frames BGR dos índices pedidos, lidos pelo VideoCapture, com a posição
+        (ms) de cada um
+        
+        Avança com grab() (sem conversão de pixels) até cada frame alvo; só
+        saltos longos pagam o seek até o keyframe anterior.
+        """
+        position = 0
+        
+        for frame_idx in frame_indices:
+            if frame_idx < position or frame_idx - position > max_grab_gap:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+                position = frame_idx
+            
+            ret = True
+            while ret and position < frame_idx:
+                ret = cap.grab()
+                position += 1
+            
+            if ret:
+                ret, frame = cap.read()
+                position += 1
+            
+            if not ret:
+                # Fim real do fluxo (a contagem de frames é só estimada)
+                return
+            
+            yield cap.get(cv2.CAP_PROP_POS_MSEC), frame
+    
+    def _iter_sampled_frames_pyav(self, container, props: Dict[str, Any],
+                                  frame_indices: List[int], max_grab_gap: int) -> Iterator[Any]:
+        """
+        Frames BGR dos índices pedidos, lidos com PyAV, com a posição (ms) de
+        cada um
+        
+        Os índices são convertidos em PTS; saltos longos usam container.seek
+        (que posiciona no keyframe anterior) e a decodificação segue até o
+        primeiro frame com PTS >= alvo.
+        """
+        stream = container.streams.video[0]
+        stream.thread_type = 'AUTO'
+        
+        rate = stream.average_rate or stream.guessed_rate or Fraction(props['fps']).limit_denominator(1001)
+        pts_per_frame = 1 / (rate * stream.time_base)
+        start = stream.start_time or 0
+        max_gap_pts = max_grab_gap * pts_per_frame
         
-        return frame_analysis
+        decoded = container.decode(stream)
+        position = None
+        
+        for frame_idx in frame_indices:
+            target = start + int(frame_idx * pts_per_frame)
+            
+            if position is None or target < position or target - position > max_gap_pts:
+                container.seek(target, stream=stream)
+                decoded = container.decode(stream)
+            
+            frame = next((f for f in decoded if f.pts is None or f.pts >= target), None)
+            if frame is None:
+                # Fim real do fluxo (a contagem de frames é só estimada)
+                return
+            
+            position = frame.pts if frame.pts is not None else target
+            pos_msec = frame.time * 1000 if frame.time is not None else 0.0
+            yield pos_msec, frame.to_ndarray(format='bgr24')
     
-    def _analyze_video_technical(self, cap) -> Dict[str, Any]:
-        """Análise técnica adicional do vídeo"""
+    def _analyze_video_technical(self, cap, props: Dict[str, Any],
+                                 pos_msec: float = 0.0) -> Dict[str, Any]:
+        """
+        Análise técnica adicional do vídeo
+        
+        Args:
+            cap: VideoCapture aberto
+            props: Propriedades lidas por _read_video_properties
+            pos_msec: Posição (ms) do último frame amostrado, que pode ter sido
+                lido com PyAV em vez do VideoCapture
+        """
         technical_info = {
             'backend': 'unknown',
             'fourcc': 'unknown',
@@ -464,14 +809,11 @@ class MediaAnalyzer(MultiFormatAnalyzer):
             technical_info['backend'] = cap.getBackendName()
             
             # FourCC (codec)
-            fourcc = cap.get(cv2.CAP_PROP_FOURCC)
-            if fourcc:
-                fourcc_str = "".join([chr((int(fourcc) >> 8 * i) & 0xFF) for i in range(4)])
-                technical_info['fourcc'] = fourcc_str
+            technical_info['fourcc'] = props['codec']
             
-            # Outras propriedades
-            technical_info['buffer_size'] = int(cap.get(cv2.CAP_PROP_BUFFERSIZE))
-            technical_info['pos_msec'] = cap.get(cv2.CAP_PROP_POS_MSEC)
+            # Outras propriedades (a posição reflete a leitura dos frames)
+            technical_info['buffer_size'] = props['buffer_size']
+            technical_info['pos_msec'] = pos_msec
             
         except Exception as e:
             logger.debug(f"Erro na análise técnica de vídeo: {e}")
@@ -479,12 +821,11 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         
         return technical_info
     
-    def _get_video_codec(self, cap) -> str:
-        """Obtém codec do vídeo"""
+    def _fourcc_to_str(self, fourcc: float) -> str:
+        """Converte o valor de CAP_PROP_FOURCC no código de 4 caracteres do codec"""
         try:
-            fourcc = cap.get(cv2.CAP_PROP_FOURCC)
             if fourcc:
-                return "".join([chr((int(fourcc) >> 8 * i) & 0xFF) for i in range(4)])
+                return struct.pack('<I', int(fourcc) & 0xFFFFFFFF).decode('latin-1')
             return 'unknown'
         except:
             return 'unknown'
@@ -494,29 +835,12 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         id3_tags = {}
         
         try:
-            # Mapeamento de tags comuns
-            tag_mapping = {
-                'TIT2': 'title',
-                'TPE1': 'artist',
-                'TALB': 'album',
-                'TDRC': 'year',
-                'TCON': 'genre',
-                'TPE2': 'album_artist',
-                'TRCK': 'track_number',
-                'TPOS': 'disc_number',
-                'COMM::eng': 'comment'
-            }
+            get_tag_name = _ID3_TAG_NAMES.get
             
-            for tag_id, value in tags.items():
-                tag_name = tag_mapping.get(str(tag_id), str(tag_id))
-                
-                # Processar valor
-                if hasattr(value, 'text'):
-                    processed_value = str(value.text[0]) if value.text else ''
-                else:
-                    processed_value = str(value)
-                
-                id3_tags[tag_name] = processed_value
+            id3_tags.update(
+                (get_tag_name(tag_id, tag_id), _id3_frame_text(value))
+                for tag_id, value in ((str(key), value) for key, value in tags.items())
+            )
                 
         except Exception as e:
             logger.debug(f"Erro ao extrair tags ID3: {e}")
@@ -529,11 +853,10 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         vorbis_tags = {}
         
         try:
-            for key, value in tags.items():
-                if isinstance(value, list):
-                    vorbis_tags[key.lower()] = value[0] if value else ''
-                else:
-                    vorbis_tags[key.lower()] = str(value)
+            vorbis_tags.update(
+                (key.lower(), (value[0] if value else '') if isinstance(value, list) else str(value))
+                for key, value in tags.items()
+            )
                     
         except Exception as e:
             logger.debug(f"Erro ao extrair comentários Vorbis: {e}")
@@ -546,27 +869,12 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         mp4_tags = {}
         
         try:
-            # Mapeamento de atoms MP4
-            atom_mapping = {
-                '©nam': 'title',
-                '©ART': 'artist',
-                '©alb': 'album',
-                '©day': 'year',
-                '©gen': 'genre',
-                'trkn': 'track_number',
-                'disk': 'disc_number',
-                '©cmt': 'comment'
-            }
+            get_tag_name = _MP4_ATOM_NAMES.get
             
-            for atom, value in tags.items():
-                tag_name = atom_mapping.get(atom, atom)
-                
-                if isinstance(value, list):
-                    processed_value = str(value[0]) if value else ''
-                else:
-                    processed_value = str(value)
-                
-                mp4_tags[tag_name] = processed_value
+            mp4_tags.update(
+                (get_tag_name(atom, atom), _first_tag_value(value))
+                for atom, value in tags.items()
+            )
                 
         except Exception as e:
             logger.debug(f"Erro ao extrair tags MP4: {e}")
@@ -579,11 +887,10 @@ class MediaAnalyzer(MultiFormatAnalyzer):
         generic_tags = {}
         
         try:
-            for key, value in tags.items():
-                if isinstance(value, list):
-                    generic_tags[str(key)] = str(value[0]) if value else ''
-                else:
-                    generic_tags[str(key)] = str(value)
+            generic_tags.update(
+                (str(key), _first_tag_value(value))
+                for key, value in tags.items()
+            )
                     
         except Exception as e:
             logger.debug(f"Erro ao extrair tags genéricas: {e}")
@@ -685,46 +992,20 @@ class MediaAnalyzer(MultiFormatAnalyzer):
             bitrate = getattr(info, 'bitrate', 0)
             sample_rate = getattr(info, 'sample_rate', 0)
             
-            quality_score = 0
-            
             # Categorizar bitrate
-            if bitrate >= 320:
-                quality_analysis['bitrate_category'] = 'Very High (320+ kbps)'
-                quality_score += 4
-            elif bitrate >= 256:
-                quality_analysis['bitrate_category'] = 'High (256+ kbps)'
-                quality_score += 3
-            elif bitrate >= 192:
-                quality_analysis['bitrate_category'] = 'Good (192+ kbps)'
-                quality_score += 2
-            elif bitrate >= 128:
-                quality_analysis['bitrate_category'] = 'Standard (128+ kbps)'
-                quality_score += 1
-            else:
-                quality_analysis['bitrate_category'] = 'Low (<128 kbps)'
+            band = bisect_right(_BITRATE_THRESHOLDS, bitrate)
+            quality_analysis['bitrate_category'] = _BITRATE_LABELS[band]
+            quality_score = _BITRATE_SCORES[band]
             
             # Categorizar sample rate
-            if sample_rate >= 96000:
-                quality_analysis['sample_rate_category'] = 'Very High (96+ kHz)'
-                quality_score += 2
-            elif sample_rate >= 48000:
-                quality_analysis['sample_rate_category'] = 'High (48+ kHz)'
-                quality_score += 1
-            elif sample_rate >= 44100:
-                quality_analysis['sample_rate_category'] = 'CD Quality (44.1 kHz)'
-                quality_score += 1
-            else:
-                quality_analysis['sample_rate_category'] = 'Low (<44.1 kHz)'
+            band = bisect_right(_SAMPLE_RATE_THRESHOLDS, sample_rate)
+            quality_analysis['sample_rate_category'] = _SAMPLE_RATE_LABELS[band]
+            quality_score += _SAMPLE_RATE_SCORES[band]
             
             # Categoria geral de qualidade
-            if quality_score >= 5:
-                quality_analysis['quality_category'] = 'Excellent'
-            elif quality_score >= 3:
-                quality_analysis['quality_category'] = 'Good'
-            elif quality_score >= 1:
-                quality_analysis['quality_category'] = 'Fair'
-            else:
-                quality_analysis['quality_category'] = 'Poor'
+            quality_analysis['quality_category'] = _AUDIO_QUALITY_LABELS[
+                bisect_right(_AUDIO_QUALITY_THRESHOLDS, quality_score)
+            ]
             
             quality_analysis['quality_score'] = quality_score
             
@@ -736,19 +1017,14 @@ class MediaAnalyzer(MultiFormatAnalyzer):
     
     def _format_duration(self, seconds: float) -> str:
         """Formata duração em segundos para formato legível"""
-        try:
-            if seconds <= 0:
-                return "00:00"
-            
-            td = timedelta(seconds=seconds)
-            total_seconds = int(td.total_seconds())
-            hours, remainder = divmod(total_seconds, 3600)
-            minutes, seconds = divmod(remainder, 60)
-            
-            if hours > 0:
-                return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
-            else:
-                return f"{minutes:02d}:{seconds:02d}"
-                
-        except Exception:
+        # Negativos, zero, NaN e infinito
+        if not 0 < seconds < math.inf:
             return "00:00"
+        
+        hours, remainder = divmod(int(seconds), 3600)
+        minutes, seconds = divmod(remainder, 60)
+        
+        if hours > 0:
+            return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+        else:
+            return f"{minutes:02d}:{seconds:02d}"
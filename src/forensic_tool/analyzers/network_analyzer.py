@@ -6,11 +6,14 @@ incluindo logs de firewall, captures de pacotes, e arquivos de configuração de
 """
 
 import json
+import mmap
+import os
 import re
 import socket
 import struct
+from collections import Counter
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -60,6 +63,42 @@ class NetworkAnalyzer(BaseAnalyzer):
         'generic_ip': re.compile(r'\b(?P<ip>\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\b')
     }
     
+    # Endereço IPv4 com octetos entre 0 e 255 (zeros à esquerda permitidos)
+    _VALID_IPV4_RE = re.compile(
+        r'(?:(?:25[0-5]|2[0-4]\d|[01]?\d?\d)\.){3}(?:25[0-5]|2[0-4]\d|[01]?\d?\d)'
+    )
+    
+    # Indicadores de atividade suspeita em logs web (aplicados sobre o texto já
+    # em minúsculas; IGNORECASE deixaria cada busca cerca de 2x mais lenta)
+    _SQLI_RE = re.compile(r'union|select|drop|insert|[\'"]')
+    _XSS_RE = re.compile(r'<script|javascript:|alert\(|onerror=')
+    _SCANNER_AGENT_RE = re.compile(r'sqlmap|nikto|nmap|masscan')
+    
+    # Trecho literal obrigatório em qualquer linha que case com o padrão do tipo;
+    # testado com `in` antes do regex para descartar linhas irrelevantes
+    _REQUIRED_SUBSTRINGS = {
+        'apache_access': '"',
+        'nginx_access': '"',
+        'iptables': 'SRC=',
+        'ssh_auth': 'sshd['
+    }
+    
+    # Padrões em bytes para a varredura direta sobre o arquivo mapeado (logs genéricos)
+    _GENERIC_IP_RE = re.compile(rb'\b\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3}\b')
+    _DOMAIN_RE = re.compile(rb'\b(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b')
+    _TIMESTAMP_RES = (
+        re.compile(rb'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'),
+        re.compile(rb'\w{3} \d{1,2} \d{2}:\d{2}:\d{2}'),
+        re.compile(rb'\[\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}')
+    )
+    _NETWORK_KEYWORDS = (b'error', b'warning', b'failed', b'denied', b'blocked', b'attack', b'intrusion')
+    
+    # Eventos detalhados guardados por lista (o total é contado à parte)
+    _MAX_EVENT_SAMPLES = 100
+    
+    _GENERIC_LOG_MAX_LINES = 10000
+    _MAX_TIMESTAMPS = 10
+    
     def can_analyze(self, file_path: Path) -> bool:
         """Verifica se o arquivo pode ser analisado por este analisador."""
         if file_path.suffix.lower() in self.SUPPORTED_EXTENSIONS:
@@ -71,33 +110,15 @@ class NetworkAnalyzer(BaseAnalyzer):
         
         return any(keyword in filename_lower for keyword in network_keywords)
     
+    def __init__(self):
+        super().__init__("NetworkAnalyzer", self.SUPPORTED_EXTENSIONS)
+    
     def analyze(self, file_path: Path) -> AnalysisResult:
         """Executa análise completa do arquivo de rede."""
         try:
             start_time = datetime.now()
             
-            # Determina o tipo de arquivo
-            file_type = self._detect_file_type(file_path)
-            
-            # Executa análise específica baseada no tipo
-            if file_type == 'pcap':
-                metadata = self._analyze_pcap_file(file_path)
-            elif file_type in ['apache_access', 'nginx_access']:
-                metadata = self._analyze_web_log(file_path, file_type)
-            elif file_type == 'iptables':
-                metadata = self._analyze_firewall_log(file_path)
-            elif file_type == 'ssh_auth':
-                metadata = self._analyze_ssh_log(file_path)
-            else:
-                metadata = self._analyze_generic_log(file_path)
-            
-            # Adiciona informações gerais
-            metadata.update({
-                'file_type': file_type,
-                'analysis_type': 'NetworkAnalyzer',
-                'file_size': file_path.stat().st_size,
-                'last_modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-            })
+            metadata = self._analyze_file(file_path)
             
             duration = (datetime.now() - start_time).total_seconds()
             
@@ -105,7 +126,8 @@ class NetworkAnalyzer(BaseAnalyzer):
                 success=True,
                 file_path=str(file_path),
                 file_name=file_path.name,
-                file_type=f"Network Log ({file_type})",
+                file_size=metadata['file_size'],
+                file_type=f"Network Log ({metadata['file_type']})",
                 analysis_type="NetworkAnalyzer",
                 metadata=metadata,
                 analysis_duration=duration
@@ -117,12 +139,59 @@ class NetworkAnalyzer(BaseAnalyzer):
                 success=False,
                 file_path=str(file_path),
                 file_name=file_path.name,
+                file_size=0,
                 file_type="Network Log",
                 analysis_type="NetworkAnalyzer",
+                metadata={},
                 error_message=str(e),
                 analysis_duration=0
             )
     
+    def analyze_many(self, file_paths: Iterable[Path],
+                     max_workers: Optional[int] = None) -> Iterator[AnalysisResult]:
+        """
+        Analisa vários arquivos de rede em paralelo, em processos separados
+        
+        A análise de logs é dominada por regex e contagens em Python, então
+        threads não escalam por causa do GIL.
+        
+        Args:
+            file_paths: Caminhos dos arquivos
+            max_workers: Número máximo de processos (padrão: número de CPUs)
+            
+        Returns:
+            Iterador de resultados na mesma ordem dos caminhos recebidos
+        """
+        return self._analyze_many_in_processes(file_paths, max_workers, chunksize_cap=4)
+    
+    def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
+        """Extrai os metadados de rede conforme o tipo de log detectado."""
+        # Determina o tipo de arquivo
+        file_type = self._detect_file_type(file_path)
+        
+        # Executa análise específica baseada no tipo
+        if file_type == 'pcap':
+            metadata = self._analyze_pcap_file(file_path)
+        elif file_type in ['apache_access', 'nginx_access']:
+            metadata = self._analyze_web_log(file_path, file_type)
+        elif file_type == 'iptables':
+            metadata = self._analyze_firewall_log(file_path)
+        elif file_type == 'ssh_auth':
+            metadata = self._analyze_ssh_log(file_path)
+        else:
+            metadata = self._analyze_generic_log(file_path)
+        
+        # Adiciona informações gerais
+        file_stat = file_path.stat()
+        metadata.update({
+            'file_type': file_type,
+            'analysis_type': 'NetworkAnalyzer',
+            'file_size': file_stat.st_size,
+            'last_modified': datetime.fromtimestamp(file_stat.st_mtime).isoformat()
+        })
+        
+        return metadata
+    
     def _detect_file_type(self, file_path: Path) -> str:
         """Detecta o tipo específico de arquivo de rede."""
         filename = file_path.name.lower()
@@ -147,10 +216,11 @@ class NetworkAnalyzer(BaseAnalyzer):
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 sample_lines = [f.readline().strip() for _ in range(5)]
                 sample_text = '\n'.join(sample_lines)
+                sample_lower = sample_text.lower()
                 
-                if 'apache' in sample_text.lower() or '"GET' in sample_text:
+                if 'apache' in sample_lower or '"GET' in sample_text:
                     return 'apache_access'
-                elif 'nginx' in sample_text.lower():
+                elif 'nginx' in sample_lower:
                     return 'nginx_access'
                 elif 'iptables' in sample_text or 'kernel:' in sample_text:
                     return 'iptables'
@@ -197,28 +267,44 @@ class NetworkAnalyzer(BaseAnalyzer):
                     'endianness': 'little' if endian == '<' else 'big'
                 })
                 
-                # Conta pacotes (básico)
-                packet_count = 0
-                while True:
-                    packet_header = f.read(16)
-                    if len(packet_header) < 16:
-                        break
-                    
-                    _, _, caplen, _ = struct.unpack(f'{endian}IIII', packet_header)
-                    f.seek(caplen, 1)  # Pula os dados do pacote
-                    packet_count += 1
-                    
-                    if packet_count > 10000:  # Limite para performance
-                        metadata['packet_count_note'] = 'Contagem limitada a 10000 pacotes'
-                        break
-                
-                metadata['packet_count'] = packet_count
+                # Conta pacotes percorrendo os cabeçalhos direto no arquivo mapeado
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    metadata['packet_count'] = self._count_pcap_packets(mm, endian)
                 
         except Exception as e:
             metadata['pcap_error'] = str(e)
         
         return metadata
     
+    @staticmethod
+    def _count_pcap_packets(data, endian: str) -> int:
+        """
+        Conta os registros de pacote de um PCAP a partir do cabeçalho global
+        
+        Apenas o campo caplen (tamanho capturado) de cada cabeçalho de 16 bytes
+        é lido, o suficiente para saltar até o próximo registro.
+        
+        Args:
+            data: Buffer com o conteúdo do arquivo (mmap ou bytes)
+            endian: Prefixo de ordem de bytes do struct ('<' ou '>')
+            
+        Returns:
+            Número de cabeçalhos de pacote completos encontrados
+        """
+        caplen_struct = struct.Struct(f'{endian}8xI4x')
+        header_size = caplen_struct.size
+        unpack_from = caplen_struct.unpack_from
+        
+        size = len(data)
+        offset = 24
+        packet_count = 0
+        while offset + header_size <= size:
+            caplen, = unpack_from(data, offset)
+            offset += header_size + caplen
+            packet_count += 1
+        
+        return packet_count
+    
     def _analyze_web_log(self, file_path: Path, log_type: str) -> Dict[str, Any]:
         """Análise de logs de servidor web."""
         metadata = {
@@ -228,12 +314,17 @@ class NetworkAnalyzer(BaseAnalyzer):
             'status_codes': {},
             'methods': {},
             'top_urls': {},
-            'suspicious_activity': []
+            'suspicious_activity': [],
+            'suspicious_activity_total': 0
         }
         
         pattern = self.LOG_PATTERNS[log_type]
+        required = self._REQUIRED_SUBSTRINGS[log_type]
         line_count = 0
         
+        # Campos acumulados em listas e contados de uma vez no final (Counter em C)
+        statuses, methods, urls = [], [], []
+        
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
@@ -242,6 +333,9 @@ class NetworkAnalyzer(BaseAnalyzer):
                         metadata['analysis_note'] = 'Análise limitada às primeiras 50000 linhas'
                         break
                     
+                    if required not in line:
+                        continue
+                    
                     match = pattern.match(line.strip())
                     if match:
                         data = match.groupdict()
@@ -249,25 +343,20 @@ class NetworkAnalyzer(BaseAnalyzer):
                         metadata['total_requests'] += 1
                         metadata['unique_ips'].add(data['ip'])
                         
-                        # Contagem de status codes
-                        status = data.get('status', 'unknown')
-                        metadata['status_codes'][status] = metadata['status_codes'].get(status, 0) + 1
-                        
-                        # Contagem de métodos HTTP
-                        method = data.get('method', 'unknown')
-                        metadata['methods'][method] = metadata['methods'].get(method, 0) + 1
-                        
-                        # URLs mais acessadas
-                        url = data.get('url', 'unknown')
-                        metadata['top_urls'][url] = metadata['top_urls'].get(url, 0) + 1
+                        statuses.append(data.get('status', 'unknown'))
+                        methods.append(data.get('method', 'unknown'))
+                        urls.append(data.get('url', 'unknown'))
                         
                         # Detecção de atividade suspeita
-                        self._detect_suspicious_web_activity(data, metadata['suspicious_activity'])
+                        metadata['suspicious_activity_total'] += self._detect_suspicious_web_activity(
+                            data, metadata['suspicious_activity']
+                        )
             
             # Converte sets para listas e limita resultados
             metadata['unique_ips'] = len(metadata['unique_ips'])
-            metadata['top_urls'] = dict(sorted(metadata['top_urls'].items(), 
-                                             key=lambda x: x[1], reverse=True)[:20])
+            metadata['status_codes'] = dict(Counter(statuses))
+            metadata['methods'] = dict(Counter(methods))
+            metadata['top_urls'] = dict(Counter(urls).most_common(20))
             
         except Exception as e:
             metadata['analysis_error'] = str(e)
@@ -283,12 +372,17 @@ class NetworkAnalyzer(BaseAnalyzer):
             'target_ips': {},
             'interfaces': set(),
             'rules_triggered': {},
-            'attack_patterns': []
+            'attack_patterns': [],
+            'attack_patterns_total': 0
         }
         
         pattern = self.LOG_PATTERNS['iptables']
+        required = self._REQUIRED_SUBSTRINGS['iptables']
         line_count = 0
         
+        # Campos acumulados em listas e contados de uma vez no final (Counter em C)
+        src_ips, dst_ips, rules = [], [], []
+        
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
@@ -297,6 +391,9 @@ class NetworkAnalyzer(BaseAnalyzer):
                         metadata['analysis_note'] = 'Análise limitada às primeiras 30000 linhas'
                         break
                     
+                    if required not in line:
+                        continue
+                    
                     match = pattern.search(line)
                     if match:
                         data = match.groupdict()
@@ -306,12 +403,12 @@ class NetworkAnalyzer(BaseAnalyzer):
                         # IPs bloqueados
                         src_ip = data.get('src_ip')
                         if src_ip:
-                            metadata['blocked_ips'][src_ip] = metadata['blocked_ips'].get(src_ip, 0) + 1
+                            src_ips.append(src_ip)
                         
                         # IPs alvo
                         dst_ip = data.get('dst_ip')
                         if dst_ip:
-                            metadata['target_ips'][dst_ip] = metadata['target_ips'].get(dst_ip, 0) + 1
+                            dst_ips.append(dst_ip)
                         
                         # Interfaces
                         in_interface = data.get('in_interface')
@@ -321,17 +418,22 @@ class NetworkAnalyzer(BaseAnalyzer):
                         # Regras
                         rule = data.get('rule')
                         if rule:
-                            metadata['rules_triggered'][rule] = metadata['rules_triggered'].get(rule, 0) + 1
+                            rules.append(rule)
                         
                         # Detecção de padrões de ataque
-                        self._detect_attack_patterns(data, metadata['attack_patterns'])
+                        metadata['attack_patterns_total'] += self._detect_attack_patterns(
+                            data, metadata['attack_patterns']
+                        )
             
             # Processa resultados
+            blocked_ips = Counter(src_ips)
+            target_ips = Counter(dst_ips)
             metadata['interfaces'] = list(metadata['interfaces'])
-            metadata['top_blocked_ips'] = dict(sorted(metadata['blocked_ips'].items(), 
-                                                    key=lambda x: x[1], reverse=True)[:20])
-            metadata['top_target_ips'] = dict(sorted(metadata['target_ips'].items(), 
-                                                   key=lambda x: x[1], reverse=True)[:20])
+            metadata['top_blocked_ips'] = dict(blocked_ips.most_common(20))
+            metadata['top_target_ips'] = dict(target_ips.most_common(20))
+            metadata['blocked_ips'] = dict(blocked_ips)
+            metadata['target_ips'] = dict(target_ips)
+            metadata['rules_triggered'] = dict(Counter(rules))
             
         except Exception as e:
             metadata['analysis_error'] = str(e)
@@ -347,12 +449,17 @@ class NetworkAnalyzer(BaseAnalyzer):
             'failed_logins': 0,
             'attacking_ips': {},
             'targeted_users': {},
-            'brute_force_attempts': []
+            'brute_force_attempts': [],
+            'brute_force_attempts_total': 0
         }
         
         pattern = self.LOG_PATTERNS['ssh_auth']
+        required = self._REQUIRED_SUBSTRINGS['ssh_auth']
         line_count = 0
         
+        # Campos acumulados em listas e contados de uma vez no final (Counter em C)
+        attacking_ips, users = [], []
+        
         try:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 for line in f:
@@ -361,6 +468,9 @@ class NetworkAnalyzer(BaseAnalyzer):
                         metadata['analysis_note'] = 'Análise limitada às primeiras 20000 linhas'
                         break
                     
+                    if required not in line:
+                        continue
+                    
                     match = pattern.search(line)
                     if match:
                         data = match.groupdict()
@@ -374,21 +484,25 @@ class NetworkAnalyzer(BaseAnalyzer):
                         if 'Failed' in event:
                             metadata['failed_logins'] += 1
                             if ip:
-                                metadata['attacking_ips'][ip] = metadata['attacking_ips'].get(ip, 0) + 1
+                                attacking_ips.append(ip)
                         elif 'Accepted' in event:
                             metadata['successful_logins'] += 1
                         
                         if user:
-                            metadata['targeted_users'][user] = metadata['targeted_users'].get(user, 0) + 1
+                            users.append(user)
                         
                         # Detecção de força bruta
-                        self._detect_brute_force(data, metadata['brute_force_attempts'])
+                        metadata['brute_force_attempts_total'] += self._detect_brute_force(
+                            data, metadata['brute_force_attempts']
+                        )
             
             # Processa resultados
-            metadata['top_attacking_ips'] = dict(sorted(metadata['attacking_ips'].items(), 
-                                                       key=lambda x: x[1], reverse=True)[:15])
-            metadata['top_targeted_users'] = dict(sorted(metadata['targeted_users'].items(), 
-                                                        key=lambda x: x[1], reverse=True)[:15])
+            attacking_counts = Counter(attacking_ips)
+            user_counts = Counter(users)
+            metadata['top_attacking_ips'] = dict(attacking_counts.most_common(15))
+            metadata['top_targeted_users'] = dict(user_counts.most_common(15))
+            metadata['attacking_ips'] = dict(attacking_counts)
+            metadata['targeted_users'] = dict(user_counts)
             
         except Exception as e:
             metadata['analysis_error'] = str(e)
@@ -400,139 +514,180 @@ class NetworkAnalyzer(BaseAnalyzer):
         metadata = {
             'log_type': 'generic_network',
             'total_lines': 0,
-            'ip_addresses': set(),
-            'domains': set(),
             'keywords': {},
-            'timestamps_found': []
+            'timestamps_found': [],
+            'unique_ips': 0,
+            'unique_domains': 0,
+            'sample_ips': [],
+            'sample_domains': []
         }
         
-        ip_pattern = self.LOG_PATTERNS['generic_ip']
-        domain_pattern = re.compile(r'\b(?:[a-zA-Z0-9-]+\.)+[a-zA-Z]{2,}\b')
-        timestamp_patterns = [
-            re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}'),
-            re.compile(r'\w{3} \d{1,2} \d{2}:\d{2}:\d{2}'),
-            re.compile(r'\[\d{2}/\w{3}/\d{4}:\d{2}:\d{2}:\d{2}')
-        ]
-        
-        network_keywords = ['error', 'warning', 'failed', 'denied', 'blocked', 'attack', 'intrusion']
-        
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    if line_num > 10000:  # Limite para performance
-                        metadata['analysis_note'] = 'Análise limitada às primeiras 10000 linhas'
-                        break
-                    
-                    metadata['total_lines'] += 1
-                    line_lower = line.lower()
-                    
-                    # Busca IPs
-                    for ip_match in ip_pattern.finditer(line):
-                        ip = ip_match.group('ip')
-                        if self._is_valid_ip(ip):
-                            metadata['ip_addresses'].add(ip)
-                    
-                    # Busca domínios
-                    for domain_match in domain_pattern.finditer(line):
-                        domain = domain_match.group()
-                        if '.' in domain and len(domain) > 3:
-                            metadata['domains'].add(domain)
-                    
-                    # Busca timestamps
-                    for ts_pattern in timestamp_patterns:
-                        ts_match = ts_pattern.search(line)
-                        if ts_match and len(metadata['timestamps_found']) < 10:
-                            metadata['timestamps_found'].append(ts_match.group())
-                    
-                    # Conta palavras-chave
-                    for keyword in network_keywords:
-                        if keyword in line_lower:
-                            metadata['keywords'][keyword] = metadata['keywords'].get(keyword, 0) + 1
-            
-            # Converte sets para contagens
-            metadata['unique_ips'] = len(metadata['ip_addresses'])
-            metadata['unique_domains'] = len(metadata['domains'])
-            metadata['sample_ips'] = list(metadata['ip_addresses'])[:20]
-            metadata['sample_domains'] = list(metadata['domains'])[:20]
-            
-            # Remove os sets originais para serialização
-            del metadata['ip_addresses']
-            del metadata['domains']
+            with open(file_path, 'rb') as f:
+                # mmap não aceita arquivos vazios
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        self._scan_generic_log(mm, metadata)
             
         except Exception as e:
             metadata['analysis_error'] = str(e)
         
         return metadata
     
-    def _detect_suspicious_web_activity(self, log_data: Dict[str, str], suspicious_list: List[Dict]):
-        """Detecta atividade suspeita em logs web."""
+    def _scan_generic_log(self, data, metadata: Dict[str, Any]):
+        """
+        Varre o conteúdo de um log genérico com um finditer por categoria
+        
+        Cada padrão percorre o buffer inteiro uma única vez (limitado às
+        primeiras linhas) em vez de ser relançado linha a linha.
+        
+        Args:
+            data: Buffer com o conteúdo do arquivo (mmap ou bytes)
+            metadata: Dicionário de metadados a ser preenchido
+        """
+        end, metadata['total_lines'] = self._line_limit_offset(data, self._GENERIC_LOG_MAX_LINES)
+        if end < len(data):
+            metadata['analysis_note'] = (
+                f'Análise limitada às primeiras {self._GENERIC_LOG_MAX_LINES} linhas'
+            )
+        
+        # Busca IPs e domínios (deduplicados ainda em bytes, decodificados só no final)
+        ip_addresses = {
+            ip for ip in (raw.decode('ascii') for raw in set(self._GENERIC_IP_RE.findall(data, 0, end)))
+            if self._is_valid_ip(ip)
+        }
+        domains = {
+            raw.decode('ascii') for raw in set(self._DOMAIN_RE.findall(data, 0, end))
+            if len(raw) > 3
+        }
+        
+        # Busca timestamps: primeira ocorrência de cada padrão por linha, na ordem do arquivo
+        timestamps = []
+        for index, pattern in enumerate(self._TIMESTAMP_RES):
+            last_line = None
+            hits = 0
+            for match in pattern.finditer(data, 0, end):
+                line_start = data.rfind(b'\n', 0, match.start())
+                if line_start == last_line:
+                    continue
+                last_line = line_start
+                timestamps.append((line_start, index, match.group()))
+                hits += 1
+                if hits == self._MAX_TIMESTAMPS:
+                    break
+        timestamps.sort()
+        metadata['timestamps_found'] = [
+            raw.decode('ascii') for _, _, raw in timestamps[:self._MAX_TIMESTAMPS]
+        ]
+        
+        # Conta palavras-chave (número de linhas em que cada uma aparece). Cada
+        # palavra é buscada como literal sobre uma cópia minúscula do trecho, o
+        # que mantém a busca rápida de substring; uma alternação única com
+        # IGNORECASE perderia esse prefixo literal.
+        lowered = data[:end].lower()
+        keywords = {}
+        for keyword in self._NETWORK_KEYWORDS:
+            count = 0
+            position = lowered.find(keyword)
+            while position >= 0:
+                count += 1
+                line_end = lowered.find(b'\n', position)
+                if line_end < 0:
+                    break
+                position = lowered.find(keyword, line_end + 1)
+            if count:
+                keywords[keyword.decode('ascii')] = count
+        metadata['keywords'] = keywords
+        
+        metadata['unique_ips'] = len(ip_addresses)
+        metadata['unique_domains'] = len(domains)
+        metadata['sample_ips'] = list(ip_addresses)[:20]
+        metadata['sample_domains'] = list(domains)[:20]
+    
+    @staticmethod
+    def _line_limit_offset(data, max_lines: int) -> Tuple[int, int]:
+        """
+        Localiza o fim das primeiras linhas de um buffer
+        
+        Args:
+            data: Buffer com o conteúdo do arquivo
+            max_lines: Número máximo de linhas a considerar
+            
+        Returns:
+            Tupla (offset logo após a última linha considerada, número de linhas)
+        """
+        size = len(data)
+        end = 0
+        lines = 0
+        while end < size and lines < max_lines:
+            newline = data.find(b'\n', end)
+            end = size if newline < 0 else newline + 1
+            lines += 1
+        return end, lines
+    
+    def _record_event(self, events: List[Dict], event_type: Optional[str], **fields) -> int:
+        """
+        Registra um evento detectado respeitando o limite de amostras
+        
+        Args:
+            events: Lista de eventos detalhados do arquivo
+            event_type: Valor do campo 'type' do evento (None para omiti-lo)
+            **fields: Demais campos do evento
+            
+        Returns:
+            Sempre 1, para ser somado ao total de eventos detectados
+        """
+        if len(events) < self._MAX_EVENT_SAMPLES:
+            if event_type is not None:
+                fields = {'type': event_type, **fields}
+            events.append(fields)
+        return 1
+    
+    def _detect_suspicious_web_activity(self, log_data: Dict[str, str], suspicious_list: List[Dict]) -> int:
+        """Detecta atividade suspeita em logs web e retorna quantos eventos encontrou."""
         ip = log_data.get('ip', '')
         url = log_data.get('url', '')
-        status = log_data.get('status', '')
         user_agent = log_data.get('user_agent', '')
+        timestamp = log_data.get('timestamp', '')
+        detected = 0
         
         # Detecção de tentativas de SQL injection
-        if any(keyword in url.lower() for keyword in ['union', 'select', 'drop', 'insert', "'", '"']):
-            suspicious_list.append({
-                'type': 'sql_injection_attempt',
-                'ip': ip,
-                'url': url,
-                'timestamp': log_data.get('timestamp', '')
-            })
+        url_lower = url.lower()
+        if self._SQLI_RE.search(url_lower):
+            detected += self._record_event(suspicious_list, 'sql_injection_attempt',
+                                           ip=ip, url=url, timestamp=timestamp)
         
         # Detecção de tentativas de XSS
-        if any(keyword in url.lower() for keyword in ['<script', 'javascript:', 'alert(', 'onerror=']):
-            suspicious_list.append({
-                'type': 'xss_attempt',
-                'ip': ip,
-                'url': url,
-                'timestamp': log_data.get('timestamp', '')
-            })
+        if self._XSS_RE.search(url_lower):
+            detected += self._record_event(suspicious_list, 'xss_attempt',
+                                           ip=ip, url=url, timestamp=timestamp)
         
         # User agents suspeitos
-        if user_agent and any(bot in user_agent.lower() for bot in ['sqlmap', 'nikto', 'nmap', 'masscan']):
-            suspicious_list.append({
-                'type': 'suspicious_user_agent',
-                'ip': ip,
-                'user_agent': user_agent,
-                'timestamp': log_data.get('timestamp', '')
-            })
+        if user_agent and self._SCANNER_AGENT_RE.search(user_agent.lower()):
+            detected += self._record_event(suspicious_list, 'suspicious_user_agent',
+                                           ip=ip, user_agent=user_agent, timestamp=timestamp)
+        
+        return detected
     
-    def _detect_attack_patterns(self, log_data: Dict[str, str], attack_list: List[Dict]):
-        """Detecta padrões de ataque em logs de firewall."""
+    def _detect_attack_patterns(self, log_data: Dict[str, str], attack_list: List[Dict]) -> int:
+        """Detecta padrões de ataque em logs de firewall e retorna quantos eventos encontrou."""
         src_ip = log_data.get('src_ip', '')
         dst_ip = log_data.get('dst_ip', '')
         
         # Detecção de port scanning (simplificado)
         if src_ip and dst_ip:
-            attack_list.append({
-                'type': 'blocked_connection',
-                'source_ip': src_ip,
-                'target_ip': dst_ip,
-                'timestamp': log_data.get('timestamp', '')
-            })
+            return self._record_event(attack_list, 'blocked_connection', source_ip=src_ip,
+                                      target_ip=dst_ip, timestamp=log_data.get('timestamp', ''))
+        return 0
     
-    def _detect_brute_force(self, log_data: Dict[str, str], brute_force_list: List[Dict]):
-        """Detecta tentativas de força bruta."""
+    def _detect_brute_force(self, log_data: Dict[str, str], brute_force_list: List[Dict]) -> int:
+        """Detecta tentativas de força bruta e retorna quantos eventos encontrou."""
         if 'Failed' in log_data.get('event', ''):
-            brute_force_list.append({
-                'ip': log_data.get('ip', ''),
-                'user': log_data.get('user', ''),
-                'timestamp': log_data.get('timestamp', '')
-            })
+            return self._record_event(brute_force_list, None, ip=log_data.get('ip', ''),
+                                      user=log_data.get('user', ''),
+                                      timestamp=log_data.get('timestamp', ''))
+        return 0
     
     def _is_valid_ip(self, ip: str) -> bool:
         """Valida se uma string é um IP válido."""
-        try:
-            parts = ip.split('.')
-            if len(parts) != 4:
-                return False
-            
-            for part in parts:
-                num = int(part)
-                if num < 0 or num > 255:
-                    return False
-            
-            return True
-        except (ValueError, AttributeError):
-            return False
+        return isinstance(ip, str) and self._VALID_IPV4_RE.fullmatch(ip) is not None
@@ -95,41 +95,15 @@ class SecurityAnalyzer(BaseAnalyzer):
         
         return False
     
+    def __init__(self):
+        super().__init__("SecurityAnalyzer", self.SUPPORTED_EXTENSIONS)
+    
     def analyze(self, file_path: Path) -> AnalysisResult:
         """Executa análise completa de segurança do arquivo."""
         try:
             start_time = datetime.now()
             
-            metadata = {
-                'security_analysis': True,
-                'file_size': file_path.stat().st_size,
-                'last_modified': datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-            }
-            
-            # Análise de entropy
-            entropy_data = self._calculate_entropy(file_path)
-            metadata['entropy_analysis'] = entropy_data
-            
-            # Detecção de assinaturas
-            signature_data = self._check_malware_signatures(file_path)
-            metadata['signature_analysis'] = signature_data
-            
-            # Análise de strings suspeitas
-            strings_data = self._analyze_suspicious_strings(file_path)
-            metadata['strings_analysis'] = strings_data
-            
-            # Análise de cabeçalho PE (se aplicável)
-            if file_path.suffix.lower() in ['.exe', '.dll', '.scr']:
-                pe_data = self._analyze_pe_header(file_path)
-                metadata['pe_analysis'] = pe_data
-            
-            # Análise de URLs e domínios
-            url_data = self._analyze_urls_and_domains(file_path)
-            metadata['url_analysis'] = url_data
-            
-            # Cálculo de score de risco
-            risk_score = self._calculate_risk_score(metadata)
-            metadata['risk_assessment'] = risk_score
+            metadata = self._analyze_file(file_path)
             
             duration = (datetime.now() - start_time).total_seconds()
             
@@ -137,6 +111,7 @@ class SecurityAnalyzer(BaseAnalyzer):
                 success=True,
                 file_path=str(file_path),
                 file_name=file_path.name,
+                file_size=metadata['file_size'],
                 file_type=f"Security Analysis ({file_path.suffix or 'unknown'})",
                 analysis_type="SecurityAnalyzer",
                 metadata=metadata,
@@ -149,12 +124,50 @@ class SecurityAnalyzer(BaseAnalyzer):
                 success=False,
                 file_path=str(file_path),
                 file_name=file_path.name,
+                file_size=0,
                 file_type="Security Analysis",
                 analysis_type="SecurityAnalyzer",
+                metadata={},
                 error_message=str(e),
                 analysis_duration=0
             )
     
+    def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
+        """Executa as verificações de segurança e retorna os metadados."""
+        file_stat = file_path.stat()
+        metadata = {
+            'security_analysis': True,
+            'file_size': file_stat.st_size,
+            'last_modified': datetime.fromtimestamp(file_stat.st_mtime).isoformat()
+        }
+        
+        # Análise de entropy
+        entropy_data = self._calculate_entropy(file_path)
+        metadata['entropy_analysis'] = entropy_data
+        
+        # Detecção de assinaturas
+        signature_data = self._check_malware_signatures(file_path)
+        metadata['signature_analysis'] = signature_data
+        
+        # Análise de strings suspeitas
+        strings_data = self._analyze_suspicious_strings(file_path)
+        metadata['strings_analysis'] = strings_data
+        
+        # Análise de cabeçalho PE (se aplicável)
+        if file_path.suffix.lower() in ['.exe', '.dll', '.scr']:
+            pe_data = self._analyze_pe_header(file_path)
+            metadata['pe_analysis'] = pe_data
+        
+        # Análise de URLs e domínios
+        url_data = self._analyze_urls_and_domains(file_path)
+        metadata['url_analysis'] = url_data
+        
+        # Cálculo de score de risco
+        risk_score = self._calculate_risk_score(metadata)
+        metadata['risk_assessment'] = risk_score
+        
+        return metadata
+    
     def _calculate_entropy(self, file_path: Path) -> Dict[str, Any]:
         """Calcula a entropy do arquivo para detectar compressão/criptografia."""
         try:
@@ -5,7 +5,7 @@ Utilitários para validação e escaneamento de arquivos
 import os
 import mimetypes
 from pathlib import Path
-from typing import Generator, List, Set, Optional, Tuple, Dict, Any
+from typing import Generator, List, Set, Optional, Tuple, Dict, Any, Container
 import logging
 import magic
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -121,7 +121,7 @@ class FileValidator:
         except Exception as e:
             return False, f"Erro na validação do arquivo: {e}"
     
-    def is_supported_extension(self, extension: str, supported_extensions: Set[str]) -> bool:
+    def is_supported_extension(self, extension: str, supported_extensions: Container[str]) -> bool:
         """Verifica se extensão é suportada"""
         return extension.lower() in supported_extensions
     
@@ -185,13 +185,14 @@ class FileScanner:
     
     def __init__(self, 
                  validator: Optional[FileValidator] = None,
-                 supported_extensions: Optional[Set[str]] = None):
+                 supported_extensions: Optional[Container[str]] = None):
         """
         Inicializa o scanner
         
         Args:
             validator: Validador de arquivos
-            supported_extensions: Extensões suportadas
+            supported_extensions: Extensões suportadas (qualquer coleção com
+                operador `in`, ex.: analyzers.FILE_TYPE_MAP)
         """
         self.validator = validator or FileValidator()
         self.supported_extensions = supported_extensions or set()
@@ -89,6 +89,28 @@ def sample_files(temp_dir: Path) -> Path:
     return samples_dir
 
 
+@pytest.fixture
+def batch_files(temp_dir: Path) -> Path:
+    """Cria arquivos de texto e de log para os testes de análise em lote"""
+    batch_dir = temp_dir / "batch"
+    batch_dir.mkdir()
+    
+    # Documentos com 1 a 4 palavras
+    for i in range(4):
+        (batch_dir / f"doc_{i}.txt").write_text("palavra " * (i + 1), encoding='utf-8')
+    
+    # Log de autenticação SSH com três falhas de login
+    (batch_dir / "auth.log").write_text(
+        "Jan  2 10:11:12 host sshd[1]: Failed password for root from 10.0.0.1 port 22\n" * 3,
+        encoding='utf-8'
+    )
+    
+    # Log genérico com duas linhas
+    (batch_dir / "server.log").write_text("ERROR 10.0.0.1 timeout\nINFO 10.0.0.2 ok\n", encoding='utf-8')
+    
+    return batch_dir
+
+
 @pytest.fixture
 def setup_logging():
     """Configura logging para testes"""
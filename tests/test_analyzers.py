@@ -0,0 +1,254 @@
+"""
+Testes para o registro de analisadores
+"""
+
+import multiprocessing
+import os
+
+import pytest
+from pathlib import Path
+
+from src.forensic_tool.analyzers import (
+    register_all_analyzers, get_available_analyzers,
+    DocumentAnalyzer, ImageAnalyzer, MediaAnalyzer, NetworkAnalyzer, SecurityAnalyzer
+)
+
+
+class TestAnalyzerRegistration:
+    """Testes para register_all_analyzers"""
+    
+    def test_registers_all_builtin_analyzers(self):
+        """Testa que os cinco analisadores embutidos são registrados"""
+        registry = register_all_analyzers()
+        
+        assert len(registry.get_all_analyzers()) == 5
+    
+    def test_registration_is_idempotent(self):
+        """Testa que registrar novamente não duplica analisadores"""
+        register_all_analyzers()
+        registry = register_all_analyzers()
+        
+        names = [analyzer.get_name() for analyzer in registry.get_all_analyzers()]
+        assert len(names) == len(set(names)) == 5
+    
+    def test_available_analyzers(self):
+        """Testa a listagem de analisadores sem importá-los"""
+        names = get_available_analyzers()
+        
+        assert names[:5] == ['image', 'document', 'media', 'network', 'security']
+    
+    def test_dispatch_by_extension(self):
+        """Testa a seleção do analisador pela extensão"""
+        registry = register_all_analyzers()
+        
+        assert registry.get_analyzer_for_file(Path("access.log")).get_name() == "NetworkAnalyzer"
+        assert registry.get_analyzer_for_file(Path("PHOTO.JPG")).get_name() == "ImageAnalyzer"
+        assert registry.get_analyzer_for_file(Path("unknown.zzz")) is None
+    
+    def test_can_analyze_uses_suffix(self):
+        """Testa que arquivos ocultos como '.jpg' não têm extensão"""
+        analyzer = ImageAnalyzer()
+        
+        assert analyzer.can_analyze(Path("PHOTO.JPG"))
+        assert not analyzer.can_analyze(Path(".jpg"))
+
+
+class TestNetworkAndSecurityAnalyzers:
+    """Testes de instanciação dos analisadores de rede e segurança"""
+    
+    def test_network_analyzer_generic_log(self, temp_dir: Path):
+        """Testa a análise de um log genérico"""
+        log_file = temp_dir / "server.log"
+        log_file.write_text("connection from 192.168.0.1 ERROR timeout\n", encoding='utf-8')
+        
+        result = NetworkAnalyzer().analyze(log_file)
+        
+        assert result.success
+        assert result.file_size == log_file.stat().st_size
+    
+    def test_network_analyzer_caps_event_samples(self, temp_dir: Path):
+        """Testa que os eventos detalhados são limitados, mas o total é preservado"""
+        log_file = temp_dir / "auth.log"
+        total = NetworkAnalyzer._MAX_EVENT_SAMPLES + 5
+        log_file.write_text("".join(
+            f"Jan  2 10:11:12 host sshd[{i}]: Failed password for root from 10.0.0.{i % 250} port 22\n"
+            for i in range(total)
+        ), encoding='utf-8')
+        
+        metadata = NetworkAnalyzer().analyze(log_file).metadata
+        
+        assert metadata['failed_logins'] == total
+        assert metadata['brute_force_attempts_total'] == total
+        assert len(metadata['brute_force_attempts']) == NetworkAnalyzer._MAX_EVENT_SAMPLES
+        assert metadata['brute_force_attempts'][0]['ip'] == '10.0.0.0'
+    
+    def test_network_analyze_many(self, batch_files: Path):
+        """Testa a análise em lote de logs de tipos diferentes"""
+        paths = [batch_files / "auth.log", batch_files / "server.log"]
+        
+        auth, server = NetworkAnalyzer().analyze_many(paths, max_workers=2)
+        
+        assert auth.metadata['log_type'] == 'ssh_authentication'
+        assert auth.metadata['failed_logins'] == 3
+        assert server.metadata['log_type'] == 'generic_network'
+        assert server.metadata['total_lines'] == 2
+        assert server.metadata['unique_ips'] == 2
+    
+    def test_security_analyzer_binary(self, temp_dir: Path):
+        """Testa a análise de segurança de um binário simples"""
+        bin_file = temp_dir / "sample.bin"
+        bin_file.write_bytes(b'\x00\x01\x02\x03' * 64)
+        
+        result = SecurityAnalyzer().analyze(bin_file)
+        
+        assert result.success
+        assert 'risk_assessment' in result.metadata
+
+
+class TestImageAnalyzer:
+    """Testes para ImageAnalyzer"""
+    
+    def test_bilevel_image_stays_single_channel(self, temp_dir: Path):
+        """Testa que uma imagem de 1 bit é analisada em escala de cinza, como no cv2.imread"""
+        Image = pytest.importorskip('PIL.Image')
+        pytest.importorskip('cv2')
+        image_file = temp_dir / "bilevel.png"
+        Image.new('1', (16, 16), 1).save(image_file)
+        
+        metadata = ImageAnalyzer().analyze(image_file).metadata
+        
+        assert metadata['opencv_channels'] == 1
+        assert 'gray_histogram' in metadata['histogram_analysis']
+    
+    def test_untagged_tiff_has_no_exif(self, temp_dir: Path):
+        """Testa que as tags estruturais do IFD0 de um TIFF não contam como EXIF"""
+        Image = pytest.importorskip('PIL.Image')
+        image_file = temp_dir / "plain.tif"
+        Image.new('RGB', (16, 16)).save(image_file)
+        
+        metadata = ImageAnalyzer().analyze(image_file).metadata
+        
+        assert metadata['has_exif'] is False
+    
+    def test_analyze_many(self, temp_dir: Path):
+        """Testa a análise em lote de imagens em modos de cor diferentes"""
+        Image = pytest.importorskip('PIL.Image')
+        pytest.importorskip('cv2')
+        paths = []
+        for width, mode in [(8, 'RGB'), (16, 'L'), (24, 'RGBA')]:
+            image_file = temp_dir / f"image_{mode}.png"
+            Image.new(mode, (width, 8)).save(image_file)
+            paths.append(image_file)
+        
+        results = list(ImageAnalyzer().analyze_many(paths, max_workers=2))
+        
+        assert [result.metadata['dimensions']['width'] for result in results] == [8, 16, 24]
+        assert [result.metadata['color_mode'] for result in results] == ['RGB', 'L', 'RGBA']
+        assert [result.metadata['opencv_channels'] for result in results] == [3, 1, 4]
+
+
+class _CrashingDocumentAnalyzer(DocumentAnalyzer):
+    """
+    Derruba o processo do pool ao analisar 'crash_*' (simula uma falha nativa)
+    
+    No processo principal a análise segue normalmente: se o arquivo fosse
+    reanalisado fora do pool, ele voltaria com sucesso e o teste falharia.
+    """
+    
+    def analyze(self, file_path: Path):
+        if file_path.name.startswith('crash_') and multiprocessing.parent_process() is not None:
+            os._exit(1)
+        return super().analyze(file_path)
+
+
+class TestDocumentAnalyzer:
+    """Testes para DocumentAnalyzer"""
+    
+    def test_pdf_metadata_matches_between_backends(self, temp_dir: Path, monkeypatch):
+        """Testa que PyMuPDF e PyPDF2 reportam os metadados do PDF no mesmo formato"""
+        PyPDF2 = pytest.importorskip('PyPDF2')
+        from src.forensic_tool.analyzers import document_analyzer
+        if not document_analyzer.FITZ_AVAILABLE:
+            pytest.skip("PyMuPDF não instalado")
+        
+        pdf_file = temp_dir / "meta.pdf"
+        writer = PyPDF2.PdfWriter()
+        writer.add_blank_page(100, 100)
+        writer.add_metadata({'/Author': 'Ana', '/CreationDate': "D:20200101120000+03'00'"})
+        with open(pdf_file, 'wb') as handle:
+            writer.write(handle)
+        
+        fitz_metadata = DocumentAnalyzer().analyze(pdf_file).metadata
+        monkeypatch.setattr(document_analyzer, 'FITZ_AVAILABLE', False)
+        pypdf_metadata = DocumentAnalyzer().analyze(pdf_file).metadata
+        
+        assert fitz_metadata['metadata'] == pypdf_metadata['metadata']
+        assert fitz_metadata['metadata']['Author'] == 'Ana'
+        assert fitz_metadata['structure_info']['pdf_version'] == pypdf_metadata['structure_info']['pdf_version']
+    
+    def test_word_text_stats_count_newline_per_paragraph(self, temp_dir: Path):
+        """Testa que cada parágrafo com texto conta com a quebra de linha que o segue"""
+        docx = pytest.importorskip('docx')
+        word_file = temp_dir / "text.docx"
+        document = docx.Document()
+        for text in ("um dois", "", "três"):
+            document.add_paragraph(text)
+        document.save(word_file)
+        
+        content_stats = DocumentAnalyzer().analyze(word_file).metadata['content_stats']
+        
+        assert content_stats['total_characters'] == len("um dois\ntrês\n")
+        assert content_stats['sample_text'] == "um dois\ntrês\n"
+        assert content_stats['total_words'] == 3
+    
+    def test_analyze_many(self, batch_files: Path):
+        """Testa que a análise em lote devolve os resultados na ordem de entrada"""
+        paths = sorted(batch_files.glob("doc_*.txt"), reverse=True)
+        
+        results = list(DocumentAnalyzer().analyze_many(paths, max_workers=2))
+        
+        assert [result.file_name for result in results] == [path.name for path in paths]
+        assert [result.metadata['content_stats']['total_words'] for result in results] == [4, 3, 2, 1]
+        assert all(result.metadata['encoding'] == 'utf-8' for result in results)
+    
+    def test_analyze_many_isolates_worker_crash(self, batch_files: Path):
+        """Testa que só o arquivo que derrubou o processo do pool falha"""
+        crash_file = batch_files / "crash_1.txt"
+        crash_file.write_text("palavra", encoding='utf-8')
+        paths = sorted(batch_files.glob("doc_*.txt"))
+        paths.insert(1, crash_file)
+        
+        results = list(_CrashingDocumentAnalyzer().analyze_many(paths, max_workers=2))
+        
+        assert [result.file_name for result in results] == [path.name for path in paths]
+        assert [result.success for result in results] == [True, False, True, True, True]
+        assert "encerrado" in results[1].error_message
+        assert results[4].metadata['content_stats']['total_words'] == 4
+
+
+class TestMediaAnalyzer:
+    """Testes para MediaAnalyzer"""
+    
+    def test_analyze_many_mixes_video_and_audio(self, temp_dir: Path):
+        """Testa que vídeos (processos) e áudio (threads) são intercalados na ordem de entrada"""
+        cv2 = pytest.importorskip('cv2')
+        np = pytest.importorskip('numpy')
+        paths = []
+        for frames in (5, 10):
+            video_file = temp_dir / f"video_{frames}.avi"
+            writer = cv2.VideoWriter(str(video_file), cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+            for _ in range(frames):
+                writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+            writer.release()
+            paths.append(video_file)
+        audio_file = temp_dir / "audio.wav"
+        audio_file.write_bytes(b"\x00" * 64)
+        paths.insert(1, audio_file)
+        
+        first, audio, second = MediaAnalyzer().analyze_many(paths, max_workers=2)
+        
+        assert first.metadata['media_type'] == second.metadata['media_type'] == 'Video'
+        assert first.metadata['video_info']['frame_count'] == 5
+        assert second.metadata['video_info']['frame_count'] == 10
+        assert audio.file_name == "audio.wav"
+        assert 'video_info' not in audio.metadata